@@ -0,0 +1,72 @@
+# assets.py
+
+import threading
+import time
+
+import pygame
+from settings import *
+from utils import SilentSound, load_sounds, play_music
+
+
+class AssetManager:
+    """Загрузка ресурсов в фоне и замер времени запуска.
+
+    Инициализирует только нужные подсистемы pygame (экран и шрифты), а
+    микшер и декодирование звуков переносит в фоновый поток, пока на экране
+    уже меню. До окончания загрузки в словаре sounds лежат беззвучные
+    заглушки; поток заменяет их на настоящие звуки в том же словаре, поэтому
+    Game, получивший ссылку на него, начинает звучать без перезапуска.
+    """
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.sounds = {name: SilentSound() for name in SOUND_FILES}
+        self.ready = threading.Event()  # Установлен, когда звуки загружены
+        self.thread = None
+        self.first_frame_time = None  # Секунды от старта до первого кадра
+        self.loaded_time = None  # Секунды от старта до загрузки звуков
+        self.reported = False
+
+    def init_subsystems(self):
+        """Инициализация только тех подсистем, без которых нельзя показать меню."""
+        pygame.display.init()
+        pygame.font.init()
+
+    def start_loading(self):
+        """Запуск фоновой загрузки звуков и музыки."""
+        self.thread = threading.Thread(target=self.load, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def load(self):
+        """Загрузка звуков (выполняется в фоновом потоке)."""
+        self.sounds.update(load_sounds())
+        play_music()
+        self.loaded_time = time.perf_counter() - self.start_time
+        self.ready.set()
+
+    def mark_frame(self):
+        """Отметка о показанном кадре; учитывается только первый."""
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter() - self.start_time
+
+    def startup_times(self):
+        """Время до первого кадра и до полной готовности в миллисекундах.
+
+        Игра считается готовой, когда показан первый кадр и загружены звуки.
+        """
+        first_frame = self.first_frame_time
+        interactive = None
+        if first_frame is not None and self.loaded_time is not None:
+            interactive = max(first_frame, self.loaded_time)
+        return {
+            "time_to_first_frame_ms": None if first_frame is None else first_frame * 1000,
+            "time_to_interactive_ms": None if interactive is None else interactive * 1000,
+        }
+
+    def report_startup(self):
+        """Однократный вывод времени запуска, как только оно известно."""
+        if self.reported or not self.ready.is_set() or self.first_frame_time is None:
+            return
+        self.reported = True
+        times = self.startup_times()
+        print(f"Первый кадр: {times['time_to_first_frame_ms']:.0f} мс, "
+              f"готовность: {times['time_to_interactive_ms']:.0f} мс")
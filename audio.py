@@ -0,0 +1,121 @@
+# audio.py
+
+import time
+
+import pygame
+from settings import *
+
+
+class SoundDispatcher:
+    """Диспетчер звуков с резервированием каналов, слиянием и бюджетом голосов.
+
+    Запросы play() за кадр только копятся, а реальные вызовы микшера делает
+    flush() раз в кадр, поэтому работа со звуком за кадр ограничена
+    SOUND_VOICES_PER_FRAME независимо от числа столкновений:
+    - у каждой категории (hit, lose, bonus) свои зарезервированные каналы;
+    - одновременные запросы одного звука звучат не более чем на стольких
+      голосах, сколько у категории каналов, а повторы в пределах
+      SOUND_COALESCE_MS после запуска сливаются;
+    - сверх бюджета кадра запросы с меньшим приоритетом отбрасываются;
+    - если свободных каналов нет, звук забирает канал у менее важной
+      категории или самый старый канал своей.
+    """
+    def __init__(self, sounds):
+        self.sounds = sounds  # Словарь звуков; может дозаполняться загрузчиком
+        self.pending = {}  # Имя звука -> число запросов в текущем кадре
+        self.last_played = {}  # Имя звука -> время последнего запуска (с)
+        self.channels = None  # Категория -> список каналов, создаются после инициализации микшера
+        self.started = {}  # Канал -> время запуска звука на нем
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def play(self, name):
+        """Запрос на проигрывание звука (будет выполнен в flush())."""
+        self.pending[name] = self.pending.get(name, 0) + 1
+
+    def setup_channels(self):
+        """Резервирование каналов по категориям; возвращает False, если микшера нет."""
+        if self.channels is not None:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        total = sum(SOUND_CHANNELS.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)  # Эти каналы не отдаются Sound.play()
+        self.channels = {}
+        index = 0
+        for category, count in SOUND_CHANNELS.items():
+            self.channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        return True
+
+    def pick_channel(self, name):
+        """Свободный канал категории или канал, который можно отобрать."""
+        own = self.channels.get(name, [])
+        for channel in own:
+            if not channel.get_busy():
+                return channel
+
+        # Отбираем самый старый канал у категорий с меньшим приоритетом, иначе у своей
+        priority = SOUND_PRIORITY.get(name, 0)
+        victims = [channel for category, channels in self.channels.items()
+                   if SOUND_PRIORITY.get(category, 0) < priority for channel in channels]
+        victims = victims or own
+        if not victims:
+            return None
+        # Сначала занимаем свободный канал, и только потом прерываем звучащий голос
+        for channel in victims:
+            if not channel.get_busy():
+                return channel
+        self.stolen += 1
+        return min(victims, key=lambda channel: self.started.get(channel, 0.0))
+
+    def flush(self):
+        """Выполнение накопленных за кадр запросов."""
+        if not self.pending:
+            return
+        pending = self.pending
+        self.pending = {}
+        if not self.setup_channels():
+            return  # Микшер еще не готов или недоступен: звуки просто пропускаются
+
+        now = time.perf_counter()
+        budget = SOUND_VOICES_PER_FRAME
+        for name in sorted(pending, key=lambda name: SOUND_PRIORITY.get(name, 0), reverse=True):
+            count = pending[name]
+            window = SOUND_COALESCE_MS.get(name, 0) / 1000
+            last = self.last_played.get(name)
+            if last is not None and now - last < window:
+                self.merged += count  # Тот же звук только что прозвучал
+                continue
+            # Одновременные запросы звучат несколькими голосами, но не больше каналов категории
+            voices = min(count, max(len(self.channels.get(name, ())), 1))
+            self.merged += count - voices
+            sound = self.sounds.get(name)
+            if not isinstance(sound, pygame.mixer.Sound):
+                continue  # Звук еще не загружен или его файла нет
+            for voice in range(voices):
+                if budget == 0:
+                    self.dropped += voices - voice  # Бюджет кадра ушел на более важные звуки
+                    break
+                channel = self.pick_channel(name)
+                if channel is None:
+                    self.dropped += 1
+                    continue
+                channel.play(sound)
+                self.started[channel] = now
+                self.last_played[name] = now
+                self.played += 1
+                budget -= 1
+
+    def stats(self):
+        """Счетчики проигранных, слитых, отброшенных и отобранных голосов."""
+        return {
+            "played": self.played,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+        }
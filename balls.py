@@ -0,0 +1,80 @@
+# balls.py
+
+import numpy as np
+import pygame
+from settings import *
+from sprites import sprite_cache, blit_circles
+
+
+class BallSystem:
+    """Все мячи игры в массивах NumPy.
+
+    Позиции, позиции на предыдущем шаге (для интерполяции) и скорости лежат
+    в массивах фиксированной емкости; живые мячи занимают префикс [0, count).
+    Мяч с индексом 0 - основной: после потери мяча остается только он.
+    """
+    def __init__(self, capacity=BALL_CAPACITY, radius=BALL_RADIUS):
+        self.capacity = capacity
+        self.radius = radius
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.speed = np.zeros((capacity, 2), dtype=np.float64)
+        self.count = 0
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Ограничивающий прямоугольник, обновляется на месте
+
+    def add(self, x, y, vx, vy):
+        """Добавление мяча. Возвращает его индекс или None, если мест нет."""
+        if self.count >= self.capacity:
+            return None
+        i = self.count
+        self.pos[i] = (x, y)
+        self.prev_pos[i] = (x, y)
+        self.speed[i] = (vx, vy)
+        self.count += 1
+        return i
+
+    def reset(self, x, y, vx, vy):
+        """Оставляет единственный мяч с заданными позицией и скоростью."""
+        self.count = 0
+        self.add(x, y, vx, vy)
+
+    def remove(self, indices):
+        """Удаление мячей по индексам заменой на последние живые."""
+        for i in sorted(indices, reverse=True):
+            last = self.count - 1
+            if i != last:
+                self.pos[i] = self.pos[last]
+                self.prev_pos[i] = self.prev_pos[last]
+                self.speed[i] = self.speed[last]
+            self.count = last
+
+    def __len__(self):
+        return self.count
+
+    def sprites(self, alpha=1.0):
+        """Спрайты мячей для Surface.blits() с интерполяцией между двумя последними шагами.
+
+        Возвращает (последовательность (поверхность, позиция), ограничивающий
+        прямоугольник) или (None, None), если мячей нет.
+        """
+        n = self.count
+        if n == 0:
+            return None, None
+        prev = self.prev_pos[:n]
+        points = (prev + (self.pos[:n] - prev) * alpha).astype(np.int32)
+        radius = self.radius
+        left, top = points.min(axis=0) - radius
+        right, bottom = points.max(axis=0) + radius + 1
+        rect = self.rect
+        rect.update(int(left), int(top), int(right - left), int(bottom - top))
+        return blit_circles(sprite_cache.circle(radius, RED), points, radius), rect
+
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка всех мячей одним вызовом Surface.blits().
+
+        Возвращает общий ограничивающий прямоугольник или None.
+        """
+        batch, rect = self.sprites(alpha)
+        if batch is not None:
+            screen.blits(batch, doreturn=False)
+        return rect
@@ -0,0 +1,129 @@
+# batch.py
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+
+import numpy as np
+from settings import *
+from simulation import Simulation, InputState
+from levels import load_levels
+
+# Уровни загружаются один раз на процесс пула, а не на каждую игру
+worker_levels = None
+
+
+def init_worker(levels_dir):
+    """Инициализация процесса пула."""
+    global worker_levels
+    worker_levels = load_levels(levels_dir)
+
+
+def autopilot(sim, deadzone):
+    """Ввод автопилота: платформа идет под мяч, который ниже всех летит вниз."""
+    balls = sim.balls
+    n = balls.count
+    falling = np.flatnonzero(balls.speed[:n, 1] > 0)
+    candidates = falling if falling.size else np.arange(n)
+    target = balls.pos[candidates[np.argmax(balls.pos[candidates, 1])], 0]
+    center = sim.bat.pos[0] + sim.bat.width / 2
+    return InputState(target < center - deadzone, target > center + deadzone, False, False)
+
+
+def run_game(job):
+    """Одна игра до конца или до max_ticks. Возвращает словарь с результатами."""
+    seed, max_ticks, deadzone = job
+    sim = Simulation(seed, levels=worker_levels)
+    lives_lost = 0
+    levels_cleared = 0
+    bonuses = Counter()
+    game_over = False
+    start = time.perf_counter()
+    while sim.tick < max_ticks:
+        for event in sim.step(autopilot(sim, deadzone)):
+            if event.kind == "ball_lost":
+                lives_lost += 1
+            elif event.kind == "bonus":
+                bonuses[event.data] += 1
+            elif event.kind == "level_cleared":
+                levels_cleared += 1
+            elif event.kind == "game_over":
+                game_over = True
+        if game_over:
+            break
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "ticks": sim.tick,
+        "duration": sim.time / 1000,  # Игровое время в секундах
+        "lives_lost": lives_lost,
+        "levels_cleared": levels_cleared,
+        "bonuses": dict(bonuses),
+        "game_over": game_over,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def percentiles(values):
+    """p50/p90/p99, среднее, минимум и максимум."""
+    values = np.asarray(values, dtype=np.float64)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"p50": p50, "p90": p90, "p99": p99, "mean": values.mean(), "min": values.min(), "max": values.max()}
+
+
+def run_batch(games, output, processes=None, first_seed=0, max_ticks=BATCH_MAX_TICKS,
+              deadzone=BATCH_DEADZONE, levels_dir=LEVELS_DIR):
+    """Прогон games игр на пуле процессов с потоковой записью в JSONL.
+
+    Каждая игра - отдельное задание со своим сидом, результаты пишутся по
+    мере готовности (порядок строк не совпадает с порядком сидов).
+    Возвращает список результатов.
+    """
+    jobs = [(seed, max_ticks, deadzone) for seed in range(first_seed, first_seed + games)]
+    processes = processes or os.cpu_count()
+    # Задания мелкие, поэтому раздаются пачками: меньше обменов между процессами
+    chunksize = max(1, games // (processes * 8))
+    results = []
+    with open(output, "w", encoding="utf-8") as file, \
+            multiprocessing.Pool(processes, init_worker, (levels_dir,)) as pool:
+        for result in pool.imap_unordered(run_game, jobs, chunksize):
+            file.write(json.dumps(result) + "\n")
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный прогон игр с автопилотом")
+    parser.add_argument("games", type=int, help="число игр")
+    parser.add_argument("-o", "--output", default="batch.jsonl", help="файл результатов (JSONL)")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="число процессов (по умолчанию - по ядрам)")
+    parser.add_argument("--seed", type=int, default=0, help="сид первой игры, дальше по порядку")
+    parser.add_argument("--max-ticks", type=int, default=BATCH_MAX_TICKS, help="предел длины игры в тиках")
+    parser.add_argument("--deadzone", type=float, default=BATCH_DEADZONE,
+                        help="допуск автопилота в пикселях (больше - хуже играет)")
+    parser.add_argument("--levels", default=LEVELS_DIR, help="каталог уровней")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_batch(args.games, args.output, args.processes, args.seed, args.max_ticks,
+                        args.deadzone, args.levels)
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(result["ticks"] for result in results)
+    print(f"Игр: {len(results)} за {elapsed:.2f} с, {ticks / elapsed:.0f} тиков/с")
+    print(f"{'метрика':<16}{'p50':>10}{'p90':>10}{'p99':>10}{'среднее':>10}{'мин':>10}{'макс':>10}")
+    for key in ("score", "duration", "ticks", "lives_lost", "levels_cleared"):
+        stats = percentiles([result[key] for result in results])
+        print(f"{key:<16}" + "".join(f"{stats[name]:>10.1f}" for name in ("p50", "p90", "p99", "mean", "min", "max")))
+    bonuses = Counter()
+    for result in results:
+        bonuses.update(result["bonuses"])
+    if bonuses:
+        print("Бонусы: " + ", ".join(f"{name} {count}" for name, count in bonuses.most_common()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# bench.py
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from settings import *
+
+try:
+    import resource  # Нет в Windows: пиковая память там не замеряется
+except ImportError:
+    resource = None
+
+SCENARIOS = ("idle", "rally", "multiball", "storm", "large_board", "menu")
+
+# Большое поле для сценария large_board: мелкие плитки на всю ширину экрана
+LARGE_TILE_SIZE = (14, 6)
+LARGE_ROWS = 36
+
+
+def init_worker(frames):
+    """Инициализация процесса замера до импорта pygame и модулей игры.
+
+    Драйверы SDL - dummy (без окна и звука), профилировщик включен и держит
+    все кадры замера.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import settings
+    settings.PROFILER_ENABLED = True
+    settings.PROFILER_HISTORY = frames
+
+
+def peak_rss_mb():
+    """Пиковый объем резидентной памяти процесса в мегабайтах или None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # macOS - байты, Linux - КБ
+
+
+def calibrate(frames=BENCH_CALIBRATION_FRAMES, sprites=BENCH_CALIBRATION_SPRITES):
+    """FPS фиксированной нагрузки без кода игры: мерило скорости машины.
+
+    Калибровка идет в том же процессе, что и сценарий, а опорными хранятся
+    отношения FPS сценария к ней, поэтому опорные замеры переносятся между
+    машинами. Нагрузка похожа на кадр игры: заливка экрана, вывод спрайтов
+    одним blits() и цикл на чистом Python. Результат - лучший из прогонов
+    по frames кадров.
+    """
+    import pygame
+
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    sprite = pygame.Surface((BALL_RADIUS * 2, BALL_RADIUS * 2))
+    sprite.fill(WHITE)
+    positions = [((i * 37) % WIDTH, (i * 53) % HEIGHT) for i in range(sprites)]
+
+    def frame(index):
+        surface.fill(BLACK)
+        surface.blits([(sprite, position) for position in positions], doreturn=False)
+        return sum((x * index + y) % 7 for x, y in positions)
+
+    # Лучший из нескольких коротких прогонов меньше зависит от случайных помех
+    best = 0.0
+    for _ in range(BENCH_CALIBRATION_RUNS):
+        start = time.perf_counter()
+        for index in range(frames):
+            frame(index)
+        best = max(best, frames / (time.perf_counter() - start))
+    return best
+
+
+def large_level():
+    """Уровень с полем LARGE_ROWS строк мелких случайных плиток."""
+    from levels import parse_level
+
+    width, height = LARGE_TILE_SIZE
+    cols = (WIDTH - TILE_PADDING) // (width + TILE_PADDING)
+    lines = ["name: Большое поле", "ball_speed: 5 -5", f"tile_size: {width} {height}",
+             "tile R: 255 0 0 1", "tile G: 0 255 0 2", "tile B: 0 0 255 3", "grid:"]
+    lines += ["?" * cols] * LARGE_ROWS
+    return parse_level("\n".join(lines), "<bench>")
+
+
+def game_frame(game, inputs, before=None):
+    """Кадр игры как в main.py: события, шаг, отрисовка. before(game) - подготовка кадра."""
+    from profiler import profiler
+
+    def frame():
+        if before is not None:
+            before(game)
+        with profiler.phase("handle_events"):
+            game.handle_events()
+        with profiler.phase("update"):
+            game.update(inputs(game.sim))
+        game.draw()
+    return frame
+
+
+def make_scenario(name, screen, seed, balls):
+    """Функция одного кадра сценария name."""
+    import numpy as np
+    from game import Game
+    from menu import MainMenu
+    from profiler import profiler
+    from simulation import NO_INPUT
+    from batch import autopilot
+
+    if name == "menu":
+        # Меню, перерисовываемое каждый кадр (как после нажатия клавиши), без сна в ожидании событий
+        menu = MainMenu(screen)
+
+        def frame():
+            with profiler.phase("menu"):
+                menu.handle_events()
+                menu.invalidate()
+                menu.draw()
+        return frame
+
+    game = Game(screen, sounds={}, record=False)
+    if name == "large_board":
+        game.sim.levels = [large_level()]
+    game.reset_game(seed)
+    sim = game.sim
+    sim.lives = 10 ** 9  # Сценарий не должен закончиться экраном конца игры
+    pilot = lambda sim: autopilot(sim, BATCH_DEADZONE)
+
+    if name == "idle":
+        # Поле без ввода игрока: один мяч, платформа стоит
+        return game_frame(game, lambda sim: NO_INPUT)
+    if name == "rally":
+        sim.set_speed_factor(BENCH_RALLY_SPEED)
+        return game_frame(game, pilot)
+    if name == "multiball":
+        rng = np.random.default_rng(seed)
+
+        def refill(game):
+            # Потеря мяча оставляет на поле один мяч: число мячей восстанавливается
+            for vx, vy in rng.choice([-5.0, 5.0], (max(0, balls + 1 - sim.balls.count), 2)).tolist():
+                sim.balls.add(WIDTH // 2, HEIGHT // 2, vx, vy)
+        return game_frame(game, pilot, refill)
+    if name == "storm":
+        frames = [0]
+
+        def shatter(game):
+            # Новое поле разбивается целиком: взрыв частиц на каждой плитке
+            frames[0] += 1
+            if frames[0] % BENCH_STORM_PERIOD:
+                return
+            sim.tiles = sim.create_tiles()
+            sim.events = []
+            for cell in list(sim.tiles):
+                while cell in sim.tiles:
+                    sim.hit_tile(cell)
+            game.present(sim.events, 0)
+        return game_frame(game, pilot, shatter)
+    if name == "large_board":
+        return game_frame(game, pilot)
+    raise ValueError(f"неизвестный сценарий: {name}")
+
+
+def run_scenario(name, frames=BENCH_FRAMES, seed=BENCH_SEED, balls=BENCH_BALLS):
+    """Замер сценария name. Выполняется в отдельном процессе (см. init_worker)."""
+    import pygame
+    from profiler import profiler
+
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        calibration = calibrate()
+        frame = make_scenario(name, screen, seed, balls)
+        for _ in range(BENCH_WARMUP_FRAMES):
+            frame()
+        profiler.clear()
+        start = time.perf_counter()
+        for _ in range(frames):
+            profiler.begin_frame()
+            frame()
+            profiler.end_frame()
+        elapsed = time.perf_counter() - start
+    finally:
+        pygame.quit()  # SDL перехватывает SIGTERM: без quit() пул не сможет остановить процесс
+    phases = {phase: {"p50": stats["p50"], "p99": stats["p99"]} for phase, stats in profiler.summary().items()}
+    fps = frames / elapsed
+    return {"frames": frames, "fps": fps, "calibration_fps": calibration, "relative": fps / calibration,
+            "phases": phases, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_suite(names=SCENARIOS, frames=BENCH_FRAMES, seed=BENCH_SEED, balls=BENCH_BALLS):
+    """Прогон сценариев, каждого в новом процессе.
+
+    Свой процесс дает сценарию чистые кэши и собственный пик памяти:
+    ru_maxrss - максимум за все время жизни процесса.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in names:
+        with context.Pool(1, init_worker, (frames,)) as pool:
+            results[name] = pool.apply(run_scenario, (name, frames, seed, balls))
+    return results
+
+
+def compare(results, baseline, threshold=BENCH_THRESHOLD):
+    """Сценарии, относительный FPS которых упал относительно baseline больше чем на threshold процентов.
+
+    Сравниваются отношения к калибровке (см. calibrate), а не абсолютные FPS.
+    Возвращает список (сценарий, падение в процентах).
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None or "relative" not in reference:
+            continue
+        drop = (reference["relative"] - result["relative"]) / reference["relative"] * 100
+        if drop > threshold:
+            regressions.append((name, drop))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности игры на сценариях")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"сценарии ({', '.join(SCENARIOS)}); по умолчанию все")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES, help="кадров в замере")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED, help="сид сценариев")
+    parser.add_argument("--balls", type=int, default=BENCH_BALLS, help="мячей в сценарии multiball")
+    parser.add_argument("-o", "--output", default=BENCH_OUTPUT, help="файл результатов (JSON)")
+    parser.add_argument("--baseline", default=BENCH_BASELINE, help="файл опорных замеров (JSON)")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD,
+                        help="допустимое падение FPS в процентах")
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как опорные")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(unknown)}")
+
+    results = run_suite(args.scenarios or SCENARIOS, args.frames, args.seed, args.balls)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=1)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print(f"{'сценарий':<14}{'FPS':>10}{'к калибр.':>10}{'опорный':>10}"
+          f"{'кадр p50':>10}{'кадр p99':>10}{'память, МБ':>12}")
+    for name, result in results.items():
+        frame = result["phases"]["frame"]
+        reference = f"{baseline[name]['relative']:.3f}" if "relative" in baseline.get(name, {}) else "-"
+        memory = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        print(f"{name:<14}{result['fps']:>10.0f}{result['relative']:>10.3f}{reference:>10}"
+              f"{frame['p50']:>10.2f}{frame['p99']:>10.2f}{memory:>12}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({**baseline, **results}, file, ensure_ascii=False, indent=1)
+        print(f"Опорные замеры записаны в {args.baseline}")
+        return
+
+    missing = [name for name in results if "relative" not in baseline.get(name, {})]
+    if missing:
+        # Без опорного замера сравнивать не с чем: предупреждение вместо провала проверки
+        print(f"Нет опорных замеров для: {', '.join(missing)} - сравнение пропущено "
+              f"(запишите их с --save-baseline)")
+    regressions = compare(results, baseline, args.threshold)
+    for name, drop in regressions:
+        print(f"Регрессия: {name} - FPS относительно калибровки ниже опорного на {drop:.1f}% "
+              f"(допустимо {args.threshold:g}%)")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
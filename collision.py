@@ -0,0 +1,122 @@
+# collision.py
+
+from math import sqrt
+
+CONTACT_EPSILON = 1e-3  # Отступ от поверхности после удара, чтобы не застревать в ней
+
+
+def sweep_circle_circle(x, y, dx, dy, cx, cy, radius):
+    """Момент, когда точка (x, y), движущаяся на (dx, dy), входит в окружность.
+
+    Возвращает (t, nx, ny) с t в [0, 1] и нормалью от центра окружности
+    или None, если пересечения за шаг нет.
+    """
+    fx = x - cx
+    fy = y - cy
+    a = dx * dx + dy * dy
+    if a == 0:
+        return None
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None
+    t = (-b - sqrt(disc)) / (2 * a)
+    if t < 0 or t > 1:
+        return None
+    return t, (fx + dx * t) / radius, (fy + dy * t) / radius
+
+
+def sweep_circle_rect(x, y, dx, dy, radius, left, top, right, bottom):
+    """Непрерывная проверка круга, движущегося на (dx, dy), против прямоугольника.
+
+    Задача сводится к лучу из центра круга против прямоугольника, раздутого на
+    радиус (со скругленными углами). Возвращает (t, nx, ny): долю шага до
+    касания и нормаль в точке контакта, или None, если удара нет. Если круг
+    уже пересекается с прямоугольником и движется внутрь, возвращается t = 0
+    с нормалью выталкивания.
+    """
+    # Круг уже перекрывает прямоугольник
+    qx = min(max(x, left), right)
+    qy = min(max(y, top), bottom)
+    ox = x - qx
+    oy = y - qy
+    dist_sq = ox * ox + oy * oy
+    if dist_sq < radius * radius:
+        if dist_sq > 0:
+            dist = sqrt(dist_sq)
+            nx, ny = ox / dist, oy / dist
+        else:
+            # Центр внутри прямоугольника: выталкиваем по оси наименьшего проникновения
+            nx, ny, depth = -1.0, 0.0, x - left
+            for cand_nx, cand_ny, cand_depth in ((1.0, 0.0, right - x), (0.0, -1.0, y - top), (0.0, 1.0, bottom - y)):
+                if cand_depth < depth:
+                    nx, ny, depth = cand_nx, cand_ny, cand_depth
+        if dx * nx + dy * ny < 0:
+            return 0.0, nx, ny
+        return None
+
+    # Луч против прямоугольника, раздутого на радиус (метод плит)
+    t_enter = float("-inf")
+    t_exit = float("inf")
+    nx = ny = 0.0
+    if dx == 0:
+        if x < left - radius or x > right + radius:
+            return None
+    else:
+        t1 = (left - radius - x) / dx
+        t2 = (right + radius - x) / dx
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter, nx, ny = t1, (-1.0 if dx > 0 else 1.0), 0.0
+        t_exit = min(t_exit, t2)
+    if dy == 0:
+        if y < top - radius or y > bottom + radius:
+            return None
+    else:
+        t1 = (top - radius - y) / dy
+        t2 = (bottom + radius - y) / dy
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter, nx, ny = t1, 0.0, (-1.0 if dy > 0 else 1.0)
+        t_exit = min(t_exit, t2)
+    if t_enter > t_exit or t_enter > 1 or t_exit <= 0:
+        return None
+
+    t = max(t_enter, 0.0)
+    hx = x + dx * t
+    hy = y + dy * t
+    # Точка входа в угловой зоне: настоящая граница там - окружность вокруг угла
+    corner_x = left if hx < left else right if hx > right else None
+    corner_y = top if hy < top else bottom if hy > bottom else None
+    if corner_x is not None and corner_y is not None:
+        return sweep_circle_circle(x, y, dx, dy, corner_x, corner_y, radius)
+    return t, nx, ny
+
+
+def sweep_circle_walls(x, y, dx, dy, radius, width):
+    """Первый удар о левую, правую или верхнюю стену за шаг: (t, nx, ny) или None."""
+    best = None
+    if dx < 0:
+        t = max((radius - x) / dx, 0.0)
+        if t <= 1:
+            best = (t, 1.0, 0.0)
+    elif dx > 0:
+        t = max((width - radius - x) / dx, 0.0)
+        if t <= 1:
+            best = (t, -1.0, 0.0)
+    if dy < 0:
+        t = max((radius - y) / dy, 0.0)
+        if t <= 1 and (best is None or t < best[0]):
+            best = (t, 0.0, 1.0)
+    return best
+
+
+def reflect(vx, vy, nx, ny):
+    """Отражение скорости от поверхности с нормалью (nx, ny)."""
+    dot = vx * nx + vy * ny
+    if dot >= 0:
+        return vx, vy  # Уже движемся от поверхности
+    return vx - 2 * dot * nx, vy - 2 * dot * ny
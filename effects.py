@@ -0,0 +1,119 @@
+# effects.py
+
+import heapq
+from itertools import count
+
+from settings import *
+
+
+class TimedEffect:
+    """Эффект бонуса с ограниченным временем действия.
+
+    apply() включает эффект, revert() отменяет именно его вклад, поэтому
+    одинаковые и разные эффекты складываются и снимаются независимо.
+    """
+    name = None
+    duration = BONUS_DURATION_MS
+
+    def apply(self, sim):
+        pass
+
+    def revert(self, sim):
+        pass
+
+
+class ExtendBat(TimedEffect):
+    """Расширение платформы."""
+    name = "extend_bat"
+    factor = 1.5
+
+    def apply(self, sim):
+        sim.bat.width *= self.factor
+        sim.extend_count += 1
+        sim.bat.is_extended = True
+
+    def revert(self, sim):
+        sim.bat.width /= self.factor
+        sim.extend_count -= 1
+        sim.bat.is_extended = sim.extend_count > 0
+
+
+class BallSpeed(TimedEffect):
+    """Изменение скорости мячей в factor раз."""
+    factor = 1.0
+
+    def apply(self, sim):
+        sim.set_speed_factor(sim.speed_factor * self.factor)
+
+    def revert(self, sim):
+        sim.set_speed_factor(sim.speed_factor / self.factor)
+
+
+class SlowBall(BallSpeed):
+    """Замедление мяча."""
+    name = "slow_ball"
+    factor = 0.5
+
+
+class SpeedUp(BallSpeed):
+    """Ускорение мяча."""
+    name = "speed_up"
+    factor = 1.5
+
+
+class Invisibility(TimedEffect):
+    """Невидимость платформы."""
+    name = "invisibility"
+
+    def apply(self, sim):
+        sim.invisibility_count += 1
+        sim.bat_visible = False
+
+    def revert(self, sim):
+        sim.invisibility_count -= 1
+        sim.bat_visible = sim.invisibility_count == 0
+
+
+# Бонусы с ограниченным временем действия; остальные срабатывают мгновенно
+TIMED_EFFECTS = {effect.name: effect for effect in (ExtendBat, SlowBall, SpeedUp, Invisibility)}
+
+
+class EffectScheduler:
+    """Очередь активных эффектов с приоритетом по времени окончания.
+
+    Время - игровые часы симуляции, которые стоят на паузе. Проверка на шаге
+    смотрит только на вершину кучи, так что без истекающих эффектов она стоит
+    O(1) независимо от числа активных эффектов и типов бонусов.
+    """
+    def __init__(self):
+        self.heap = []  # (время окончания, порядковый номер, эффект)
+        self.order = count()  # Порядок добавления для одинакового времени окончания
+
+    def add(self, sim, effect, now):
+        """Включение эффекта до момента now + effect.duration."""
+        effect.apply(sim)
+        heapq.heappush(self.heap, (now + effect.duration, next(self.order), effect))
+
+    def advance(self, sim, now):
+        """Отмена всех эффектов, время которых истекло к моменту now."""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            _, _, effect = heapq.heappop(heap)
+            effect.revert(sim)
+
+    def clear(self):
+        """Удаление всех эффектов без отмены (при сбросе игры)."""
+        self.heap = []
+
+    def restore(self, entries):
+        """Замена очереди записями (время окончания, номер, эффект) без apply()."""
+        self.heap = list(entries)
+        heapq.heapify(self.heap)
+        self.order = count(max((order for _, order, _ in self.heap), default=-1) + 1)
+
+    def active(self):
+        """Активные эффекты: список (время окончания, эффект) по возрастанию времени."""
+        return [(end, effect) for end, _, effect in sorted(self.heap)]
+
+    def __len__(self):
+        return len(self.heap)
@@ -0,0 +1,135 @@
+# endless.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from settings import *
+from tilegrid import TileGrid
+
+_executor = None  # Общий поток генерации чанков, создается при первой надобности
+
+
+def chunk_executor():
+    """Поток для генерации чанков впрок."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+    return _executor
+
+
+class ChunkSource:
+    """Процедурные чанки строк плиток для бесконечного режима.
+
+    Чанк - chunk_rows строк по cols ячеек. Номер чанка определяет уровень,
+    чьи типы плиток (цвета и прочность) в нем используются, а содержимое
+    разыгрывается генератором с сидом (seed, номер чанка). Поэтому чанк не
+    зависит от того, в каком потоке и когда он создан, и повторы, снимки и
+    перемотка остаются детерминированными. Впрок держится ahead чанков,
+    пройденные выбрасываются, так что память постоянна.
+    """
+    def __init__(self, levels, seed, cols, chunk_rows=ENDLESS_CHUNK_ROWS, ahead=ENDLESS_CHUNKS_AHEAD,
+                 threaded=ENDLESS_THREAD):
+        self.levels = levels
+        self.seed = seed
+        self.cols = cols
+        self.chunk_rows = chunk_rows
+        self.ahead = ahead
+        self.threaded = threaded
+        self.chunks = {}  # Номер чанка -> Future или (hits, color)
+        # Палитра сетки - палитры всех уровней подряд; offsets - начало палитры уровня
+        self.offsets = np.cumsum([0] + [len(level.palette) for level in levels[:-1]])
+        self.palette = [color for level in levels for color in level.palette]
+
+    def level_of(self, index):
+        """Номер уровня, типы плиток которого используются в чанке index."""
+        return index // ENDLESS_CHUNKS_PER_LEVEL % len(self.levels)
+
+    def generate(self, index):
+        """Чанк index: массивы прочности и индексов цвета (chunk_rows x cols)."""
+        level_index = self.level_of(index)
+        level = self.levels[level_index]
+        rng = np.random.default_rng([self.seed, index])
+        shape = (self.chunk_rows, self.cols)
+        types = rng.integers(0, len(level.hits), shape)
+        hits = level.hits[types]
+        hits[rng.random(shape) >= ENDLESS_DENSITY] = 0
+        color = (types + self.offsets[level_index]).astype(np.uint8)
+        return hits, color
+
+    def request(self, index):
+        """Запуск генерации чанка, если его еще нет."""
+        if index not in self.chunks:
+            if self.threaded:
+                self.chunks[index] = chunk_executor().submit(self.generate, index)
+            else:
+                self.chunks[index] = self.generate(index)
+
+    def row(self, number):
+        """Строка потока number: (прочность, индексы цвета)."""
+        index, offset = divmod(number, self.chunk_rows)
+        for ahead in range(self.ahead + 1):
+            self.request(index + ahead)
+        for old in [old for old in self.chunks if old < index]:
+            del self.chunks[old]  # Пройденные чанки больше не нужны
+        chunk = self.chunks[index]
+        if not isinstance(chunk, tuple):
+            chunk = self.chunks[index] = chunk.result()  # Обычно уже готов: заказан заранее
+        hits, color = chunk
+        return hits[offset], color[offset]
+
+
+class TileStream:
+    """Бесконечное поле: окно резидентных строк, которое сдвигается вниз.
+
+    Сетка плиток симуляции - это окно из rows строк. Каждые
+    ENDLESS_SCROLL_SECONDS игрового времени все плитки опускаются на строку: нижняя строка выбрасывается, сверху
+    встает следующая строка потока из ChunkSource. Столкновения и отрисовка
+    работают с той же сеткой, поэтому видят только резидентные строки, а
+    стоимость кадра и память не зависят от длительности сессии.
+    """
+    def __init__(self, levels, seed, tick_rate=TICK_RATE, rows=ENDLESS_ROWS):
+        tile_width, tile_height = levels[0].tile_size
+        self.tile_size = (tile_width, tile_height)
+        self.cols = (WIDTH - TILE_PADDING) // (tile_width + TILE_PADDING)
+        self.rows = rows
+        self.interval = round(ENDLESS_SCROLL_SECONDS * tick_rate)  # Тиков между сдвигами
+        self.source = ChunkSource(levels, seed, self.cols)
+        self.generated = 0  # Номер следующей строки потока
+        self.countdown = self.interval  # Тиков до следующего сдвига
+
+    @property
+    def palette(self):
+        return self.source.palette
+
+    @property
+    def level(self):
+        """Уровень, из которого взята верхняя строка (для скорости мяча и интерфейса)."""
+        return self.source.level_of(max(self.generated - 1, 0) // self.source.chunk_rows)
+
+    def create_tiles(self):
+        """Начальное окно: верхние ENDLESS_START_ROWS строк из потока."""
+        hits = np.zeros((self.rows, self.cols), dtype=np.int16)
+        color = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        grid = TileGrid.from_arrays(hits, color, self.palette, *self.tile_size)
+        for _ in range(ENDLESS_START_ROWS):
+            self.scroll(grid)
+        return grid
+
+    def scroll(self, grid):
+        """Сдвиг окна на строку вниз с новой строкой сверху."""
+        grid.shift_down(*self.source.row(self.generated))
+        self.generated += 1
+
+    def advance(self, grid):
+        """Отсчет тика; возвращает True, если окно сдвинулось."""
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = self.interval
+        self.scroll(grid)
+        return True
+
+    def seek(self, generated, countdown):
+        """Положение потока после восстановления снимка (сетка восстанавливается отдельно)."""
+        self.generated = generated
+        self.countdown = countdown
@@ -1,59 +1,91 @@
 # game.py
 
+import itertools
+
+import numpy as np
 import pygame
-import random
 from settings import *
 from objects import *
+from particles import ParticleSystem
+from simulation import Simulation, InputState
+from replay import ReplayRecorder
+from snapshot import RewindBuffer, take_snapshot, restore_snapshot
+from renderer import RetainedRenderer
+import gpu
+from profiler import profiler
+from governor import governor
+from gcpolicy import gc_policy
+from audio import SoundDispatcher
+from scheduler import REDRAW_EVENTS
 from utils import draw_text, load_sounds, play_music  # Импорт функций из utils.py
 
+# Надписи, которые появляются при подборе бонуса
+BONUS_LABELS = {
+    "extend_bat": "Расширение платформы!",
+    "slow_ball": "Замедление мяча!",
+    "extra_life": "+1 жизнь!",
+    "speed_up": "Ускорение мяча!",
+    "multi_ball": "Мульти-мяч!",
+    "invisibility": "Невидимость!",
+}
+
+
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, sounds=None, record=True):
         self.screen = screen
-        self.bat = Bat()
-        self.ball = Ball()
-        self.level = 0
-        self.tiles = self.create_tiles()
-        self.bonus = Bonus()
-        self.score = 0
-        self.lives = 3
-        self.balls = [self.ball]
+        self.sim = Simulation()  # Игровая логика без экрана и звука
+        self.view = self.sim  # Состояние, которое рисуется; при конвейере - копия из снимков
+        self.pipeline = None  # Поток симуляции (SimPipeline) в конвейерном режиме
+        self.particles = ParticleSystem(rng=np.random.default_rng(self.sim.seed))  # Общий пул частиц
+        self.record = record and REPLAY_FILE is not None
+        self.recorder = None  # Запись текущей игры (сид и ввод по тикам)
+        self.rewind_buffer = RewindBuffer(tick_rate=self.sim.tick_rate)  # Снимки последних секунд
+        self.start_snapshot = None  # Состояние в начале игры для быстрого перезапуска
+        self.emitters = EmitterPool(self.particles)  # Завершившиеся эффекты переиспользуются
         self.explosions = []
         self.bonus_effects = []
         self.bonus_texts = []  # Список для хранения текстов бонусов
-        self.sounds = load_sounds()
+        # Звуки можно передать готовыми (их загружает AssetManager в фоне)
+        if sounds is None:
+            sounds = load_sounds()
+            play_music()
+        self.sounds = sounds
+        self.audio = SoundDispatcher(sounds)  # Все звуки идут через диспетчер с бюджетом на кадр
         self.paused = False
         self.show_exit_dialog = False
+        self.quit_requested = False  # Окно закрыто на экране конца игры
         self.dialog_options = ["Да", "Нет"]
         self.selected_dialog_option = 0
-
-        # Таймеры для бонусов
-        self.bat_extend_timer = 0  # Таймер для расширения платформы
-        self.slow_ball_timer = 0  # Таймер для замедления мяча
-        self.speed_up_timer = 0  # Таймер для ускорения мяча
-        self.invisibility_timer = 0  # Таймер для невидимости платформы
-
-        # Сохраняем исходные значения
-        self.original_bat_width = self.bat.width
-        self.original_ball_speed = self.ball.speed.copy()
-        play_music()
-
-    def create_tiles(self):
-        """Создание массива плиток."""
-        tiles = []
-        for row in range(6):  # 6 рядов плиток
-            for col in range(8):  # 8 плиток в ряду
-                tile_data = random.choice(LEVELS[self.level]["tiles"])
-                x = col * (TILE_WIDTH + TILE_PADDING) + TILE_PADDING
-                y = row * (TILE_HEIGHT + TILE_PADDING) + TILE_OFFSET_Y
-                tiles.append(Tile(x, y, tile_data["color"], tile_data["hits"]))
-        return tiles
-
-    def handle_events(self):
-        """Обработка событий."""
-        for event in pygame.event.get():
+        self.dirty = True  # На паузе кадр перерисовывается только после изменений
+        self.hud = None  # Кэш полосы интерфейса: (значения, поверхность, занятая область)
+        self.bonus_rect = pygame.Rect(0, 0, 0, 0)  # Прямоугольник бонуса, обновляется на месте
+        # Кэширующий отрисовщик: плитки в отдельном слое, на экран - только изменения.
+        # В GPU-окне вместо него рисуют текстуры SDL2
+        if gpu.active_display is not None:
+            self.renderer = gpu.GpuRenderer(self, gpu.active_display)
+        elif RENDER_MODE == "retained":
+            self.renderer = RetainedRenderer(self)
+        else:
+            self.renderer = None
+
+    # Состояние игры хранится в симуляции, Game только отображает его
+    bat = property(lambda self: self.view.bat)
+    balls = property(lambda self: self.view.balls)
+    tiles = property(lambda self: self.view.tiles)
+    bonus = property(lambda self: self.view.bonus)
+    score = property(lambda self: self.view.score)
+    lives = property(lambda self: self.view.lives)
+    level = property(lambda self: self.view.level)
+
+    def handle_events(self, events=None):
+        """Обработка событий; events - уже полученные события, иначе очередь pygame."""
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
+            if event.type in REDRAW_EVENTS:
+                self.invalidate()
             if event.type == pygame.KEYDOWN:
+                self.dirty = True
                 if self.show_exit_dialog:
                     # Обработка событий для диалога выхода
                     if event.key == pygame.K_LEFT:
@@ -66,14 +98,20 @@ class Game:
                         else:  # Выбрано "Нет"
                             self.show_exit_dialog = False
                             self.paused = False  # Снимаем паузу
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_overlay()  # Оверлей профилировщика
                 else:
                     # Обработка событий для игры
                     if event.key == pygame.K_p:
                         self.paused = not self.paused
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.rewind()  # Перемотка на несколько секунд назад
+                    elif event.key == pygame.K_r:
+                        self.restart()  # Та же раскладка заново
                     elif event.key == pygame.K_ESCAPE:
                         self.show_exit_dialog = True  # Показать диалог выхода
                         self.paused = True  # Ставим игру на паузу
-            return True
+        return True
 
     def draw_exit_dialog(self):
         """Отрисовка диалога выхода."""
@@ -83,7 +121,7 @@ class Game:
         dialog_y = (HEIGHT - dialog_height) // 2
 
         # Отрисовка фона диалога
-        pygame.draw.rect(self.screen, BLACK, (dialog_x, dialog_y, dialog_width, dialog_height))
+        dialog_rect = pygame.draw.rect(self.screen, BLACK, (dialog_x, dialog_y, dialog_width, dialog_height))
         pygame.draw.rect(self.screen, WHITE, (dialog_x, dialog_y, dialog_width, dialog_height), 2)
 
         # Отрисовка текста
@@ -93,232 +131,277 @@ class Game:
         for i, option in enumerate(self.dialog_options):
             color = WHITE if i == self.selected_dialog_option else (128, 128, 128)
             draw_text(self.screen, option, dialog_x + 100 + i * 150, dialog_y + 120, color=color, font_size=30)
+        return dialog_rect
+
+    def update(self, inputs=None):
+        """Обновление состояния игры.
 
-    def update(self):
-        """Обновление состояния игры."""
+        inputs - ввод тика; по умолчанию читается клавиатура (при повторе
+        ввод берется из записи).
+        """
         if self.paused or self.show_exit_dialog:  # Если игра на паузе или открыт диалог
             return True
 
-        current_time = pygame.time.get_ticks()
-
-        # Отмена эффекта расширения платформы
-        if self.bat_extend_timer and current_time >= self.bat_extend_timer:
-            self.bat.width = self.original_bat_width  # Возвращаем исходную ширину
-            self.bat.is_extended = False  # Сбрасываем флаг расширения
-            self.bat_extend_timer = 0  # Сбрасываем таймер
-
-        # Отмена эффекта замедления мяча
-        if self.slow_ball_timer and current_time >= self.slow_ball_timer:
-            for ball in self.balls:
-                ball.speed[0] = self.original_ball_speed[0]
-                ball.speed[1] = self.original_ball_speed[1]
-            self.slow_ball_timer = 0  # Сбрасываем таймер
-
-        # Отмена эффекта ускорения мяча
-        if self.speed_up_timer and current_time >= self.speed_up_timer:
-            for ball in self.balls:
-                ball.speed[0] = self.original_ball_speed[0]
-                ball.speed[1] = self.original_ball_speed[1]
-            self.speed_up_timer = 0  # Сбрасываем таймер
-
-        # Отмена эффекта невидимости платформы
-        if self.invisibility_timer and current_time >= self.invisibility_timer:
-            self.bat_visible = True  # Возвращаем видимость платформы
-            self.invisibility_timer = 0  # Сбрасываем таймер
-
-        # Обновление текстов бонусов
-        for bonus_text in self.bonus_texts[:]:
-            bonus_text.update()
-            if bonus_text.is_exploded and all(particle["life"] <= 0 for particle in bonus_text.particles):
-                self.bonus_texts.remove(bonus_text)  # Удаляем текст, если анимация завершена
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
-            self.bat.move_left()
-        if keys[pygame.K_RIGHT]:
-            self.bat.move_right()
-
-        for ball in self.balls:
-            ball.update()
-
-        self.check_collisions()
+        if inputs is None:
+            inputs = self.poll_inputs()
+        self.present(self.step(inputs))
         return True
 
-    def check_collisions(self):
-        """Проверка столкновений."""
-        for ball in self.balls:
-            # Отскок мяча от стен
-            if ball.pos[0] <= ball.radius or ball.pos[0] >= WIDTH - ball.radius:
-                ball.speed[0] = -ball.speed[0]
-            if ball.pos[1] <= ball.radius:
-                ball.speed[1] = -ball.speed[1]
-
-            # Проверка столкновения мяча с платформой
-            if (self.bat.pos[0] <= ball.pos[0] <= self.bat.pos[0] + self.bat.width) and (
-                ball.pos[1] >= self.bat.pos[1] - ball.radius
-            ):
-                relative_intersect_x = (self.bat.pos[0] + (self.bat.width / 2)) - ball.pos[0]
-                normalized_intersect_x = relative_intersect_x / (self.bat.width / 2)
-                ball.speed[0] = -normalized_intersect_x * 5
-                ball.speed[1] = -abs(ball.speed[1])
-                self.score += 1
-                self.sounds["hit"].play()
-                self.bat.jump = 10
-
-                # Создаем бонус с вероятностью 10%
-                if random.randint(1, 10) == 1:
-                    self.bonus.active = True
-                    self.bonus.pos = [random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 200)]
-
-            # Проверка столкновения мяча с плитками
-            for tile in self.tiles[:]:
-                if tile.active and tile.rect.colliderect(
-                    pygame.Rect(ball.pos[0] - ball.radius, ball.pos[1] - ball.radius, ball.radius * 2, ball.radius * 2)
-                ):
-                    tile.hits -= 1
-                    if tile.hits <= 0:
-                        tile.active = False
-                        self.explosions.append(TileExplosion(tile.rect.centerx, tile.rect.centery))
-                    ball.speed[1] = -ball.speed[1]
-                    self.score += 10
-                    self.sounds["hit"].play()
-
-            # Проверка столкновения мяча с бонусом
-            if self.bonus.active:
-                distance = ((ball.pos[0] - self.bonus.pos[0]) ** 2 + (ball.pos[1] - self.bonus.pos[1]) ** 2) ** 0.5
-                if distance <= ball.radius + self.bonus.radius:
-                    self.activate_bonus(random.choice(BONUS_TYPES))
-                    self.bonus.active = False
-                    self.bonus_effects.append(BonusEffect(self.bonus.pos[0], self.bonus.pos[1]))
-
-            # Проверка проигрыша (мяч ушел за платформу)
-            if ball.pos[1] >= HEIGHT - ball.radius:
-                self.lives -= 1
-                self.explosions.append(TileExplosion(ball.pos[0], ball.pos[1]))
-                self.sounds["lose"].play()
-
-                # Удаляем все мячи, кроме одного
-                if len(self.balls) > 1:
-                    self.balls = [self.balls[0]]  # Оставляем только первый мяч
-
-                # Сброс позиции оставшегося мяча
-                self.balls[0].pos = [WIDTH // 2, HEIGHT // 2]
-                self.balls[0].speed = LEVELS[self.level]["ball_speed"]
-
-                if self.lives == 0:
-                    self.game_over()
-
-    def activate_bonus(self, bonus_type):
-        """Активация бонуса."""
-        if bonus_type == "extend_bat":
-            self.bat.width *= 1.5  # Увеличиваем ширину платформы
-            self.bat.is_extended = True  # Устанавливаем флаг расширения
-            self.bat_extend_timer = pygame.time.get_ticks() + 30000  # Устанавливаем таймер на 30 секунд
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "Расширение платформы!"))
-        elif bonus_type == "slow_ball":
-            for ball in self.balls:
-                ball.speed[0] *= 0.5
-                ball.speed[1] *= 0.5
-            self.slow_ball_timer = pygame.time.get_ticks() + 30000  # Устанавливаем таймер на 30 секунд
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "Замедление мяча!"))
-        elif bonus_type == "extra_life":
-            self.lives += 1  # Бонус на жизнь не требует таймера
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "+1 жизнь!"))
-        elif bonus_type == "speed_up":
-            for ball in self.balls:
-                ball.speed[0] *= 1.5
-                ball.speed[1] *= 1.5
-            self.speed_up_timer = pygame.time.get_ticks() + 30000  # Устанавливаем таймер на 30 секунд
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "Ускорение мяча!"))
-        elif bonus_type == "multi_ball":
-            for _ in range(2):
-                new_ball = Ball()
-                new_ball.pos = self.ball.pos.copy()
-                new_ball.speed = [random.choice([-5, 5]), random.choice([-5, 5])]
-                self.balls.append(new_ball)
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "Мульти-мяч!"))
-        elif bonus_type == "invisibility":
-            self.bat_visible = False
-            self.invisibility_timer = pygame.time.get_ticks() + 30000  # Устанавливаем таймер на 30 секунд
-            self.bonus_texts.append(BonusText(self.bonus.pos[0], self.bonus.pos[1], "Невидимость!"))
-
-        self.sounds["bonus"].play()
+    def poll_inputs(self):
+        """Ввод тика с клавиатуры."""
+        keys = pygame.key.get_pressed()
+        return InputState(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], self.paused, self.show_exit_dialog)
+
+    def step(self, inputs):
+        """Шаг игровой логики: симуляция, запись повтора и снимков. Возвращает события.
+
+        Ничего не рисует и не звучит, поэтому в конвейерном режиме выполняется
+        в потоке симуляции.
+        """
+        events = self.sim.step(inputs)
+        if self.recorder is not None:
+            self.recorder.record(self.sim, inputs)
+        self.rewind_buffer.record(self.sim)
+        for event in events:
+            if event.kind == "level_cleared":
+                # Симуляция уже перешла на новое поле; слой плиток перестроится при отрисовке
+                gc_policy.transition()  # Полная сборка между уровнями, а не посреди игры
+        return events
+
+    def present(self, events, ticks=1):
+        """Звук и визуальные эффекты для событий и ticks шагов частиц."""
+        for event in events:
+            self.handle_sim_event(event)
+
+        # Обновление текстов бонусов и частиц
+        with profiler.phase("particles"):
+            for _ in range(ticks):
+                for bonus_text in self.bonus_texts:
+                    bonus_text.update()
+                self.particles.update()
+        # Эффекты, все частицы которых уже умерли, возвращаются в пул
+        self.emitters.retire(self.bonus_texts)
+        self.emitters.retire(self.explosions)
+        self.emitters.retire(self.bonus_effects)
+
+    def handle_sim_event(self, event):
+        """Звук и визуальные эффекты для события симуляции."""
+        if event.kind == "bat_hit":
+            self.audio.play("hit")
+            self.bat.jump = 10
+        elif event.kind == "tile_hit":
+            self.audio.play("hit")
+            if self.renderer is not None:
+                self.renderer.patch_tile(event.data)
+        elif event.kind == "tile_destroyed":
+            self.audio.play("hit")
+            if self.renderer is not None:
+                self.renderer.patch_tile(event.data)
+            self.explosions.append(self.emitters.acquire(TileExplosion, event.x, event.y))
+        elif event.kind == "tiles_scrolled":
+            if self.renderer is not None:
+                self.renderer.invalidate_tiles()  # Сдвинулись все плитки: слой строится заново
+        elif event.kind == "ball_lost":
+            self.audio.play("lose")
+            self.explosions.append(self.emitters.acquire(TileExplosion, event.x, event.y))
+        elif event.kind == "bonus":
+            self.audio.play("bonus")
+            self.bonus_texts.append(self.emitters.acquire(BonusText, event.x, event.y, BONUS_LABELS[event.data]))
+            self.bonus_effects.append(self.emitters.acquire(BonusEffect, event.x, event.y))
+        elif event.kind == "game_over":
+            self.game_over()
 
     def game_over(self):
         """Завершение игры."""
+        self.save_replay()
+        self.audio.flush()
         self.screen.fill(BLACK)
         draw_text(self.screen, f"Игра окончена! Ваш счет: {self.score}", WIDTH // 2 - 150, HEIGHT // 2 - 50)
         draw_text(self.screen, "Нажмите ПРОБЕЛ, чтобы сыграть снова", WIDTH // 2 - 250, HEIGHT // 2)
-        pygame.display.flip()
+        gpu.present()
 
+        # Ждем нажатия, не тратя процессор: поток спит до следующего события
         waiting = True
         while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        waiting = False
-                        self.reset_game()
-
-    def reset_game(self):
-        """Сброс игры."""
-        self.score = 0
-        self.lives = 3
-        self.level = 0
-        self.balls = [self.ball]
-        self.tiles = self.create_tiles()
-        self.bonus.active = False
-        self.ball.pos = [WIDTH // 2, HEIGHT // 2]
-        self.ball.speed = LEVELS[self.level]["ball_speed"]
-        self.bat.pos = [WIDTH // 2 - self.bat.width // 2, HEIGHT - 50]
-
-    def draw(self):
-        """Отрисовка всех объектов."""
-        self.screen.fill(BLACK)
-        for tile in self.tiles:
-            tile.draw(self.screen)
-        self.bat.draw(self.screen)
-        for ball in self.balls:
-            ball.draw(self.screen)
-        self.bonus.draw(self.screen)
-
-        for explosion in self.explosions[:]:
-            explosion.update()
-            explosion.draw(self.screen)
-            if all(particle["life"] <= 0 for particle in explosion.particles):
-                self.explosions.remove(explosion)
-
-        for effect in self.bonus_effects[:]:
-            effect.update()
-            effect.draw(self.screen)
-            if all(particle["life"] <= 0 for particle in effect.particles):
-                self.bonus_effects.remove(effect)
-        # Отрисовка текстов бонусов
-        for bonus_text in self.bonus_texts:
-            bonus_text.draw(self.screen)
-
-        draw_text(self.screen, f"Очки: {self.score}", 10, 10)
-        draw_text(self.screen, f"Жизни: {self.lives}", WIDTH - 150, 10)
-        draw_text(self.screen, f"Уровень: {self.level + 1}", WIDTH // 2 - 50, 10)
-
-        if self.paused or self.show_exit_dialog:  # Если игра на паузе или открыт диалог
-            draw_text(self.screen, "Пауза", WIDTH // 2 - 50, HEIGHT // 2, font_size=50)
-
-        if self.show_exit_dialog:
-            self.draw_exit_dialog()  # Отрисовка диалога выхода
-
-        def reset_game(self):
-            """Сброс игры."""
-            self.score = 0
-            self.lives = 3
-            self.level = 0
-            self.balls = [self.ball]
-            self.tiles = self.create_tiles()
-            self.bonus.active = False
-            self.ball.pos = [WIDTH // 2, HEIGHT // 2]
-            self.ball.speed = LEVELS[self.level]["ball_speed"]
-            self.bat.pos = [WIDTH // 2 - self.bat.width // 2, HEIGHT - 50]
-
-        pygame.display.flip()
\ No newline at end of file
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                self.quit_requested = True  # Главный цикл завершится и сам закроет pygame
+                return
+            if event.type in REDRAW_EVENTS:
+                gpu.present()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    waiting = False
+                    self.reset_game()
+
+    def on_sim(self, action):
+        """Выполнение действия над симуляцией: в потоке симуляции, если он запущен.
+
+        Возвращает результат действия.
+        """
+        if self.pipeline is not None:
+            return self.pipeline.call(action)
+        return action()
+
+    def reset_game(self, seed=None, endless=None):
+        """Сброс игры (с заданным сидом - для повтора записи); endless - бесконечный режим, None - прежний."""
+        self.on_sim(lambda: self.reset_sim(seed, endless))
+        self.clear_effects()
+        gc_policy.transition()  # Уровень готов: полная сборка и заморозка выживших объектов
+        gc_policy.gameplay()
+
+    def reset_sim(self, seed=None, endless=None):
+        """Сброс симуляции, записи повтора и буфера перемотки."""
+        self.sim.reset(seed, endless)
+        self.particles.rng = np.random.default_rng(self.sim.seed)
+        self.recorder = (ReplayRecorder(self.sim.seed, self.sim.tick_rate, endless=self.sim.endless)
+                         if self.record else None)
+        self.start_snapshot = take_snapshot(self.sim)
+        self.rewind_buffer.clear()
+
+    def invalidate(self):
+        """Следующий кадр будет нарисован целиком, даже на паузе."""
+        self.dirty = True
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    @property
+    def idle(self):
+        """На экране ничего не меняется без ввода: игра на паузе и кадр уже нарисован."""
+        return (self.paused or self.show_exit_dialog) and not self.dirty
+
+    def clear_effects(self):
+        """Удаление частиц и надписей (после сброса или перемотки)."""
+        self.invalidate()
+        self.particles.clear()
+        self.emitters.release_all(self.explosions)
+        self.emitters.release_all(self.bonus_effects)
+        self.emitters.release_all(self.bonus_texts)
+
+    def rewind(self):
+        """Перемотка игры на REWIND_SECONDS назад."""
+        if self.on_sim(self.rewind_sim) is not None:
+            self.clear_effects()
+
+    def rewind_sim(self):
+        """Перемотка симуляции; запись повтора обрезается до того же тика. Возвращает тик или None."""
+        tick = self.rewind_buffer.rewind(self.sim)
+        if tick is not None and self.recorder is not None:
+            self.recorder.truncate(tick)
+        return tick
+
+    def restart(self):
+        """Быстрый перезапуск текущей игры из снимка без создания плиток заново."""
+        self.on_sim(self.restart_sim)
+        self.clear_effects()
+
+    def restart_sim(self):
+        """Возврат симуляции к снимку начала игры."""
+        restore_snapshot(self.sim, self.start_snapshot)
+        if self.recorder is not None:
+            self.recorder.truncate(0)
+        self.rewind_buffer.clear()
+
+    def save_replay(self):
+        """Сохранение записи текущей игры в REPLAY_FILE."""
+        self.on_sim(self.write_replay)
+
+    def write_replay(self):
+        """Запись повтора в файл, если в нем есть хоть один тик."""
+        if self.recorder is not None and self.recorder.ticks:
+            self.recorder.save(REPLAY_FILE)
+
+    def draw(self, alpha=1.0):
+        """Отрисовка всех объектов.
+
+        alpha - доля шага симуляции, прошедшая после последнего шага: подвижные
+        объекты рисуются между двумя последними состояниями.
+        """
+        if self.idle:
+            return  # Пауза: прошлый кадр все еще на экране
+        self.dirty = False
+        with profiler.phase("audio"):
+            self.audio.flush()  # Звуки, накопленные за кадр
+        if self.renderer is not None:
+            self.renderer.draw(alpha)
+            return
+
+        with profiler.phase("draw_tiles"):
+            self.screen.fill(BLACK)
+            self.tiles.draw(self.screen)
+        self.draw_dynamic(alpha)
+        with profiler.phase("flip"):
+            pygame.display.flip()
+
+    def draw_hud_values(self, surface):
+        """Очки, жизни и уровень. Возвращает прямоугольники надписей."""
+        return [
+            draw_text(surface, f"Очки: {self.score}", 10, 10),
+            draw_text(surface, f"Жизни: {self.lives}", WIDTH - 150, 10),
+            draw_text(surface, f"Уровень: {self.level + 1}", WIDTH // 2 - 50, 10),
+        ]
+
+    def render_hud(self):
+        """Полоса интерфейса одной поверхностью; перерисовывается только при изменении значений.
+
+        Возвращает (поверхность, занятая надписями область, изменилась ли поверхность).
+        """
+        values = (self.score, self.lives, self.level)
+        if self.hud is not None and self.hud[0] == values:
+            return self.hud[1], self.hud[2], False
+        surface = pygame.Surface((WIDTH, HUD_HEIGHT), pygame.SRCALPHA)
+        first, *rest = self.draw_hud_values(surface)
+        area = first.unionall(rest)
+        self.hud = (values, surface, area)
+        return surface, area, True
+
+    def draw_dynamic(self, alpha=1.0, hud=True):
+        """Отрисовка подвижных объектов и интерфейса поверх плиток.
+
+        hud=False - полоса интерфейса уже есть в слое отрисовщика.
+        Возвращает список перерисованных прямоугольников (None пропускаются).
+        """
+        screen = self.screen
+        rects = []
+        # Все круги кадра (мячи, бонус, частицы) выводятся одним Surface.blits()
+        batches = []
+        with profiler.phase("draw_objects"):
+            if self.view.bat_visible:
+                rects.append(self.bat.draw(screen, alpha))
+            batch, rect = self.balls.sprites(alpha)
+            if batch is not None:
+                batches.append(batch)
+                rects.append(rect)
+            sprite = self.bonus.sprite()
+            if sprite is not None:
+                batches.append((sprite,))
+                self.bonus_rect.update(sprite[1], sprite[0].get_size())
+                rects.append(self.bonus_rect)
+
+        with profiler.phase("draw_particles"):
+            # На низких ступенях качества рисуются не все частицы
+            batch, rect = self.particles.sprites(step=governor.quality["particle_draw_step"])
+            if batch is not None:
+                batches.append(batch)
+                rects.append(rect)
+            if batches:
+                screen.blits(itertools.chain.from_iterable(batches), doreturn=False)
+
+        with profiler.phase("draw_hud"):
+            # Отрисовка текстов бонусов
+            for bonus_text in self.bonus_texts:
+                rects.append(bonus_text.draw(screen))
+
+            if hud and governor.quality["hud_on_change"]:
+                surface, area, _ = self.render_hud()
+                rects.append(screen.blit(surface, area, area))
+            elif hud:
+                rects.extend(self.draw_hud_values(screen))
+
+            if self.paused or self.show_exit_dialog:  # Если игра на паузе или открыт диалог
+                rects.append(draw_text(screen, "Пауза", WIDTH // 2 - 50, HEIGHT // 2, font_size=50))
+
+            if self.show_exit_dialog:
+                rects.append(self.draw_exit_dialog())  # Отрисовка диалога выхода
+            rects.append(profiler.draw_overlay(screen))
+        return rects
@@ -0,0 +1,109 @@
+# gcpolicy.py
+
+import gc
+from time import perf_counter
+
+import numpy as np
+from settings import *
+
+
+class GcPolicy:
+    """Политика сборщика мусора и счетчики его работы.
+
+    Во время игры полные сборки (поколение 2) не запускаются: их порог
+    поднимается до GC_GAMEPLAY_GEN2_THRESHOLD. Полная сборка выполняется на
+    переходах - при старте игры, смене уровня и в меню, - после чего все
+    выжившие объекты (уровни, шрифты, спрайты, звуки) замораживаются
+    gc.freeze() и больше не просматриваются сборками младших поколений.
+
+    Каждая сборка замеряется через gc.callbacks. Аллокации за кадр - прирост
+    счетчика поколения 0, то есть созданные минус освобожденные объекты,
+    за которыми следит сборщик: именно этот прирост запускает сборки.
+    """
+    def __init__(self, enabled=GC_POLICY_ENABLED, gen2_threshold=GC_GAMEPLAY_GEN2_THRESHOLD,
+                 history=GC_HISTORY):
+        self.enabled = enabled
+        self.default_threshold = gc.get_threshold()
+        self.gen2_threshold = gen2_threshold
+        self.collections = [0, 0, 0]  # Сборки по поколениям
+        self.pause_total = [0.0, 0.0, 0.0]  # Суммарные паузы по поколениям (секунды)
+        self.pause_max = 0.0
+        self.frame_allocs = np.zeros(history, dtype=np.int64)
+        self.frame_pauses = np.zeros(history, dtype=np.float64)
+        self.position = 0  # Следующая строка кольцевого буфера
+        self.filled = 0
+        self.allocs = 0  # Аллокации текущего кадра до последней сборки
+        self.base = 0  # Счетчик поколения 0 в начале кадра или после сборки
+        self.pause = 0.0  # Паузы сборщика в текущем кадре
+        self.started = 0.0
+        gc.callbacks.append(self.on_collect)
+
+    def on_collect(self, phase, info):
+        """Обратный вызов сборщика: замер паузы и учет аллокаций до сборки."""
+        if phase == "start":
+            self.allocs += gc.get_count()[0] - self.base
+            self.base = 0  # Сборка обнуляет счетчик поколения 0
+            self.started = perf_counter()
+            return
+        pause = perf_counter() - self.started
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self.pause_total[generation] += pause
+        self.pause_max = max(self.pause_max, pause)
+        self.pause += pause
+
+    def gameplay(self):
+        """Начало игры: без автоматических полных сборок."""
+        if self.enabled:
+            threshold0, threshold1, _ = self.default_threshold
+            gc.set_threshold(threshold0, threshold1, self.gen2_threshold)
+
+    def transition(self):
+        """Переход (новая игра, уровень): полная сборка и заморозка выживших объектов."""
+        if self.enabled:
+            gc.unfreeze()
+            gc.collect()
+            gc.freeze()
+
+    def menu(self):
+        """Меню: обычные пороги сборщика и полная сборка мусора, накопленного за игру."""
+        if self.enabled:
+            gc.set_threshold(*self.default_threshold)
+            self.transition()
+
+    def begin_frame(self):
+        """Начало кадра."""
+        self.allocs = 0
+        self.base = gc.get_count()[0]
+        self.pause = 0.0
+
+    def end_frame(self):
+        """Конец кадра: аллокации и паузы сборщика в кольцевой буфер."""
+        self.frame_allocs[self.position] = self.allocs + gc.get_count()[0] - self.base
+        self.frame_pauses[self.position] = self.pause
+        self.position = (self.position + 1) % self.frame_allocs.size
+        self.filled = min(self.filled + 1, self.frame_allocs.size)
+
+    def stats(self):
+        """Аллокации за кадр, число сборок и паузы по поколениям (мс)."""
+        allocs = self.frame_allocs[:self.filled]
+        pauses = self.frame_pauses[:self.filled] * 1000
+        return {
+            "allocs_per_frame": float(allocs.mean()) if self.filled else 0.0,
+            "allocs_max": int(allocs.max()) if self.filled else 0,
+            "collections": list(self.collections),
+            "pause_ms_total": [pause * 1000 for pause in self.pause_total],
+            "pause_ms_max": self.pause_max * 1000,
+            "frame_pause_ms_max": float(pauses.max()) if self.filled else 0.0,
+            "frozen": gc.get_freeze_count(),
+        }
+
+    def report(self):
+        """Вывод счетчиков сборщика в консоль."""
+        stats = self.stats()
+        print(f"Сборщик мусора: аллокаций за кадр {stats['allocs_per_frame']:.1f} (макс. {stats['allocs_max']}), "
+              f"сборок по поколениям {stats['collections']}, "
+              f"самая долгая пауза {stats['pause_ms_max']:.2f} мс, заморожено объектов {stats['frozen']}")
+
+
+gc_policy = GcPolicy()
@@ -0,0 +1,92 @@
+# governor.py
+
+import numpy as np
+from settings import *
+
+
+class QualityGovernor:
+    """Регулятор качества по бюджету кадра.
+
+    Главный цикл сообщает время работы каждого активного кадра (без сна в
+    ожидании). Если скользящее среднее за window кадров превышает бюджет
+    1 / FPS, качество понижается на одну ступень QUALITY_TIERS, а если
+    держится заметно ниже бюджета - повышается. Пороги понижения и повышения
+    разнесены, и после каждой смены ступени окно набирается заново и
+    выдерживается пауза cooldown кадров, поэтому качество не скачет туда и
+    обратно на границе бюджета.
+    """
+    def __init__(self, tiers=QUALITY_TIERS, fps=FPS, window=GOVERNOR_WINDOW,
+                 downgrade=GOVERNOR_DOWNGRADE, upgrade=GOVERNOR_UPGRADE, cooldown=GOVERNOR_COOLDOWN,
+                 enabled=GOVERNOR_ENABLED, scalable=RENDER_BACKEND == "gpu"):
+        self.tiers = tiers
+        # Разрешение отрисовки снижает только GPU-окно; без него ступени с
+        # render_scale < 1 ничего не экономят, и регулятор до них не опускается
+        self.max_tier = len(tiers) - 1 if scalable else max(
+            index for index, tier in enumerate(tiers) if tier["render_scale"] == 1.0)
+        self.budget = 1.0 / (fps or REFERENCE_TICK_RATE)
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.downgrade = downgrade
+        self.upgrade = upgrade
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.tier = 0  # Текущая ступень: 0 - полное качество
+        self.changes = 0  # Сколько раз менялась ступень
+        self.count = 0  # Кадров в окне после последней смены
+        self.wait = 0  # Кадров до следующей возможной смены
+
+    @property
+    def quality(self):
+        """Параметры текущей ступени качества."""
+        return self.tiers[self.tier]
+
+    def observe(self, frame_time):
+        """Учет времени работы кадра (секунды); возвращает True, если ступень сменилась."""
+        if not self.enabled:
+            return False
+        window = self.samples.size
+        self.samples[self.count % window] = frame_time
+        self.count += 1
+        if self.wait > 0:
+            self.wait -= 1
+            return False
+        if self.count < window:
+            return False
+
+        mean = self.samples.mean()
+        if mean > self.budget * self.downgrade and self.tier < self.max_tier:
+            self.set_tier(self.tier + 1)
+            return True
+        if mean < self.budget * self.upgrade and self.tier > 0:
+            self.set_tier(self.tier - 1)
+            return True
+        return False
+
+    def set_tier(self, tier):
+        """Переход на ступень tier с новым окном замеров."""
+        self.tier = tier
+        self.changes += 1
+        self.count = 0
+        self.wait = self.cooldown
+
+    def scale(self, amount):
+        """Число частиц для эффекта с учетом ступени (не меньше одной)."""
+        return max(1, round(amount * self.quality["particle_spawn"]))
+
+    def stats(self):
+        """Телеметрия: ступень, число смен и среднее время кадра в окне (мс)."""
+        filled = min(self.count, self.samples.size)
+        return {
+            "tier": self.tier,
+            "changes": self.changes,
+            "mean_ms": float(self.samples[:filled].mean()) * 1000 if filled else 0.0,
+            "budget_ms": self.budget * 1000,
+        }
+
+    def report(self):
+        """Вывод телеметрии регулятора в консоль."""
+        stats = self.stats()
+        print(f"Качество: ступень {stats['tier']} из {self.max_tier}, смен: {stats['changes']}, "
+              f"кадр {stats['mean_ms']:.1f} мс при бюджете {stats['budget_ms']:.1f} мс")
+
+
+governor = QualityGovernor()
@@ -0,0 +1,284 @@
+# gpu.py
+
+import numpy as np
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture, get_drivers
+from settings import *
+from profiler import profiler
+from governor import governor
+from utils import text_cache
+from sprites import sprite_cache, PARTICLE_COLORS
+
+SDL_BLENDMODE_BLEND = 1  # Значение SDL_BLENDMODE_BLEND для Texture.blend_mode
+
+# Открытое GPU-окно; None - игра выводится через pygame.display
+active_display = None
+
+
+def present():
+    """Показ кадра, нарисованного на программном экране (меню, конец игры)."""
+    if active_display is not None:
+        active_display.present_screen()
+    else:
+        pygame.display.flip()
+
+
+def find_driver(name):
+    """Индекс драйвера рендера SDL по имени или -1 (выбор SDL)."""
+    if name is None:
+        return -1
+    for index, info in enumerate(get_drivers()):
+        if info.name == name:
+            return index
+    return -1
+
+
+class GpuDisplay:
+    """Окно с аппаратным рендером SDL2 вместо pygame.display.
+
+    Игра рисует в фиксированном логическом разрешении WIDTH x HEIGHT, а SDL
+    масштабирует кадр под любой размер окна. Меню, диалоги и оверлеи
+    по-прежнему рисуются программно на поверхность screen, которая при
+    необходимости загружается в текстуру. Без видеокарты (CI) достаточно
+    драйвера "software".
+    """
+    def __init__(self, title, size=GPU_WINDOW_SIZE, driver=GPU_RENDER_DRIVER, vsync=GPU_VSYNC):
+        global active_display
+        self.window = Window(title, size, resizable=True)
+        self.renderer = Renderer(self.window, index=find_driver(driver), vsync=vsync, target_texture=True)
+        self.renderer.logical_size = (WIDTH, HEIGHT)  # Аппаратное масштабирование под окно
+        self.screen = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)  # Программный холст
+        self.screen_texture = Texture(self.renderer, (WIDTH, HEIGHT), streaming=True)
+        self.screen_texture.blend_mode = SDL_BLENDMODE_BLEND
+        active_display = self
+
+    def draw_screen(self):
+        """Наложение программного холста поверх уже нарисованного кадра."""
+        self.screen_texture.update(self.screen)
+        self.screen_texture.draw()
+
+    def present_screen(self):
+        """Показ кадра, целиком нарисованного на программном холсте."""
+        self.renderer.draw_color = (*BLACK, 255)
+        self.renderer.clear()
+        self.draw_screen()
+        self.renderer.present()
+
+
+class GpuRenderer:
+    """Отрисовка игры текстурами SDL2 с тем же интерфейсом, что у RetainedRenderer.
+
+    Плитки рисуются в текстуру-слой и перерисовываются в ней только при
+    ударе; подвижные объекты - копии небольших белых текстур (прямоугольник,
+    круги нужных радиусов), окрашенных модуляцией цвета, частицы - копии из
+    одного атласа спрайтов всех цветов палитры, текст - текстуры,
+    созданные из поверхностей общего кэша текста. Каждый кадр рисуется
+    целиком: копирование текстур для GPU дешевле учета грязных областей.
+    На ступени качества с render_scale < 1 кадр рисуется в текстуру
+    пониженного разрешения и растягивается на окно.
+    """
+    def __init__(self, game, display):
+        self.game = game
+        self.display = display
+        self.renderer = display.renderer
+        self.layer = Texture(self.renderer, (WIDTH, HEIGHT), target=True)  # Слой плиток
+        self.tiles = None  # Набор плиток, по которому построен слой
+        self.box = self.white_texture(pygame.Surface((1, 1)))  # Растягивается до любого прямоугольника
+        self.circles = {}  # Радиус -> текстура белого круга
+        self.atlases = {}  # Радиус -> (атлас частиц, исходные прямоугольники по номеру цвета)
+        self.texts = {}  # Поверхность текста -> текстура
+        self.hud_texture = None  # Полоса интерфейса при hud_on_change
+        self.frame = None  # Цель рендера пониженного разрешения
+
+    def white_texture(self, surface):
+        """Белая текстура из поверхности (цвет задается модуляцией)."""
+        surface.fill(WHITE)
+        return Texture.from_surface(self.renderer, surface)
+
+    def circle(self, radius):
+        """Текстура белого круга радиуса radius."""
+        texture = self.circles.get(radius)
+        if texture is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, WHITE, (radius, radius), radius)
+            texture = Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = SDL_BLENDMODE_BLEND
+            self.circles[radius] = texture
+        return texture
+
+    def particle_atlas(self, radius):
+        """Текстура со спрайтами частиц всех цветов PARTICLE_COLORS и их прямоугольники (n, 4)."""
+        atlas = self.atlases.get(radius)
+        if atlas is None:
+            size = radius * 2
+            columns = int(np.ceil(np.sqrt(len(PARTICLE_COLORS))))
+            rows = -(-len(PARTICLE_COLORS) // columns)
+            indices = np.arange(len(PARTICLE_COLORS))
+            rects = np.empty((len(PARTICLE_COLORS), 4), dtype=np.int32)
+            rects[:, 0] = indices % columns * size
+            rects[:, 1] = indices // columns * size
+            rects[:, 2:] = size
+            surface = pygame.Surface((columns * size, rows * size), pygame.SRCALPHA)
+            surface.blits(zip(sprite_cache.particle_sprites(radius).tolist(), rects[:, :2].tolist()), doreturn=False)
+            texture = Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = SDL_BLENDMODE_BLEND
+            atlas = self.atlases[radius] = (texture, rects)
+        return atlas
+
+    def draw_text(self, text, x, y, color=WHITE, font_size=FONT_SIZE):
+        """Текст через кэш текстур; поверхность берется из общего кэша текста."""
+        surface = text_cache.render(text, color, font_size)
+        texture = self.texts.get(surface)
+        if texture is None:
+            if len(self.texts) >= GPU_TEXT_TEXTURES:
+                self.texts.clear()  # Поверхности могли быть вытеснены из кэша текста
+            texture = Texture.from_surface(self.renderer, surface)
+            self.texts[surface] = texture
+        texture.draw(dstrect=(x, y, surface.get_width(), surface.get_height()))
+
+    def fill(self, color, rect):
+        """Залитый прямоугольник."""
+        self.box.color = color
+        self.box.draw(dstrect=rect)
+
+    def draw_tile(self, cell):
+        """Плитка в текущую цель рендера."""
+        tiles = self.tiles
+        rect = tiles.rect(cell)
+        self.fill(tiles.palette[tiles.color[cell]], rect)
+        hits = int(tiles.hits[cell])
+        if hits > 1:
+            self.draw_text(str(hits), rect.centerx, rect.centery - 5, font_size=20)
+
+    def rebuild(self):
+        """Полная перерисовка слоя плиток."""
+        renderer = self.renderer
+        renderer.target = self.layer
+        renderer.draw_color = (*BLACK, 255)
+        renderer.clear()
+        for cell in self.tiles:
+            self.draw_tile(cell)
+        renderer.target = None
+
+    def patch_tile(self, cell):
+        """Перерисовка одной плитки в слое после удара."""
+        if self.tiles is not self.game.tiles:
+            return  # Слой все равно будет перестроен при отрисовке
+        renderer = self.renderer
+        renderer.target = self.layer
+        self.fill(BLACK, self.tiles.rect(cell))
+        if cell in self.tiles:
+            self.draw_tile(cell)
+        renderer.target = None
+
+    def invalidate(self):
+        """Кадр и так рисуется целиком; метод нужен для совместимости с RetainedRenderer."""
+
+    def invalidate_tiles(self):
+        """Слой плиток будет перестроен (все плитки сдвинулись)."""
+        self.tiles = None
+
+    def frame_target(self, scale):
+        """Текстура кадра для разрешения scale от логического."""
+        size = (round(WIDTH * scale), round(HEIGHT * scale))
+        if self.frame is None or self.frame.get_rect().size != size:
+            self.frame = Texture(self.renderer, size, target=True)
+        return self.frame
+
+    def draw_hud(self):
+        """Очки, жизни и уровень; при hud_on_change - одной текстурой, обновляемой при изменении."""
+        game = self.game
+        if not governor.quality["hud_on_change"]:
+            self.draw_text(f"Очки: {game.score}", 10, 10)
+            self.draw_text(f"Жизни: {game.lives}", WIDTH - 150, 10)
+            self.draw_text(f"Уровень: {game.level + 1}", WIDTH // 2 - 50, 10)
+            return
+        surface, area, changed = game.render_hud()
+        if changed or self.hud_texture is None:
+            self.hud_texture = Texture.from_surface(self.renderer, surface)
+            self.hud_texture.blend_mode = SDL_BLENDMODE_BLEND
+        self.hud_texture.draw(srcrect=area, dstrect=area)
+
+    def draw(self, alpha=1.0):
+        """Отрисовка кадра."""
+        game = self.game
+        renderer = self.renderer
+        scale = governor.quality["render_scale"]
+        with profiler.phase("draw_tiles"):
+            if game.tiles is not self.tiles:
+                self.tiles = game.tiles
+                self.rebuild()
+            if scale < 1:
+                renderer.target = self.frame_target(scale)
+                renderer.scale = (scale, scale)  # Рисование в логических координатах
+            renderer.draw_color = (*BLACK, 255)
+            renderer.clear()
+            self.layer.draw()
+
+        with profiler.phase("draw_objects"):
+            bat = game.bat
+            if game.view.bat_visible:
+                bat.update_color()
+                self.fill(bat.colors[bat.color_index], bat.interpolated_rect(alpha))
+            balls = game.balls
+            n = balls.count
+            if n:
+                radius = balls.radius
+                prev = balls.prev_pos[:n]
+                rects = np.empty((n, 4), dtype=np.int32)
+                rects[:, :2] = (prev + (balls.pos[:n] - prev) * alpha).astype(np.int32) - radius
+                rects[:, 2:] = radius * 2
+                texture = self.circle(radius)
+                texture.color = RED
+                draw = texture.draw
+                for rect in rects.tolist():
+                    draw(None, rect)
+            bonus = game.bonus
+            if bonus.active:
+                texture = self.circle(bonus.radius)
+                texture.color = bonus.next_color()
+                texture.draw(dstrect=(int(bonus.pos[0]) - bonus.radius, int(bonus.pos[1]) - bonus.radius,
+                                      bonus.radius * 2, bonus.radius * 2))
+
+        with profiler.phase("draw_particles"):
+            particles = game.particles
+            n = particles.count
+            if n:
+                radius = 3  # Как в ParticleSystem.draw
+                step = governor.quality["particle_draw_step"]
+                # Все частицы - копии из одного атласа: цвет выбирает исходный прямоугольник,
+                # а не модуляция текстуры перед каждой копией
+                texture, atlas_rects = self.particle_atlas(radius)
+                sources = atlas_rects[particles.color_index[:n:step]]
+                targets = sources.copy()
+                targets[:, :2] = particles.pos[:n:step].astype(np.int32) - radius
+                draw = texture.draw
+                for source, target in zip(sources.tolist(), targets.tolist()):
+                    draw(source, target)
+
+        with profiler.phase("draw_hud"):
+            for bonus_text in game.bonus_texts:
+                if not bonus_text.is_exploded:
+                    self.draw_text(bonus_text.text, bonus_text.x, bonus_text.y, font_size=30)
+            self.draw_hud()
+            if game.paused or game.show_exit_dialog:
+                self.draw_text("Пауза", WIDTH // 2 - 50, HEIGHT // 2, font_size=50)
+
+            if scale < 1:
+                # Кадр пониженного разрешения растягивается на все окно
+                renderer.target = None
+                renderer.draw_color = (*BLACK, 255)
+                renderer.clear()
+                self.frame.draw(dstrect=(0, 0, WIDTH, HEIGHT))
+
+            # Диалог и оверлей профилировщика рисуются программно поверх кадра
+            if game.show_exit_dialog or profiler.overlay:
+                screen = self.display.screen
+                screen.fill((0, 0, 0, 0))
+                if game.show_exit_dialog:
+                    game.draw_exit_dialog()
+                profiler.draw_overlay(screen)
+                self.display.draw_screen()
+
+        with profiler.phase("flip"):
+            renderer.present()
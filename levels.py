@@ -0,0 +1,253 @@
+# levels.py
+
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+from settings import *
+
+# Формат текстового файла уровня (*.lvl):
+#
+#   # комментарий
+#   name: Начало
+#   ball_speed: 5 -5
+#   tile_size: 95 20        (необязательно, по умолчанию TILE_WIDTH x TILE_HEIGHT)
+#   tile R: 255 0 0 1       символ плитки: цвет R G B и прочность
+#   tile G: 0 255 0 2
+#   grid:
+#   RG.?RG..
+#   ????????
+#
+# В сетке "." - пустая ячейка, "?" - случайная плитка из объявленных,
+# остальные символы - плитки, объявленные строками tile. Все строки сетки
+# одной длины.
+
+LEVEL_EXTENSION = ".lvl"
+EMPTY_CELL = 0  # Код пустой ячейки в скомпилированной сетке
+RANDOM_CELL = 255  # Код случайной плитки; плитка типа i хранится как i + 1
+MAX_TILE_TYPES = RANDOM_CELL - 1
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHIIHHffHH")  # magic, версия, rows, cols, размер плитки, скорость мяча, типов, длина имени
+TILE_TYPE = struct.Struct("<BBBH")  # R, G, B, прочность
+MAGIC = b"BLVL"
+
+
+class LevelError(Exception):
+    """Ошибка в файле уровня."""
+    def __init__(self, path, line, message):
+        super().__init__(f"{path}:{line}: {message}" if line else f"{path}: {message}")
+
+
+class Level:
+    """Скомпилированный уровень.
+
+    Сетка cells - массив uint8 (rows x cols) с кодами ячеек. Для больших
+    уровней он отображен на кэш-файл через mmap и не копируется в память
+    при загрузке.
+    """
+    def __init__(self, name, ball_speed, tile_size, palette, hits, cells):
+        self.name = name
+        self.ball_speed = ball_speed  # (vx, vy) в пикселях за опорный шаг
+        self.tile_size = tile_size  # (ширина, высота) плитки
+        self.palette = palette  # Цвета типов плиток
+        self.hits = hits  # Прочность типов плиток, int16
+        self.cells = cells
+
+    @property
+    def rows(self):
+        return self.cells.shape[0]
+
+    @property
+    def cols(self):
+        return self.cells.shape[1]
+
+    def layout(self, rng):
+        """Прочность и индекс цвета каждой ячейки; случайные ячейки разыгрываются через rng."""
+        types = self.cells.astype(np.int16) - 1  # -1 - пустая ячейка
+        random_cells = self.cells == RANDOM_CELL
+        if random_cells.any():
+            picker = np.random.default_rng(rng.getrandbits(64))
+            types[random_cells] = picker.integers(0, len(self.hits), int(random_cells.sum()))
+        empty = types < 0
+        types[empty] = 0
+        hits = self.hits[types]
+        hits[empty] = 0
+        return hits, types.astype(np.uint8)
+
+
+def parse_level(text, path="<level>"):
+    """Разбор текста уровня с проверкой. Возвращает Level с сеткой в памяти."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    ball_speed = None
+    tile_size = (TILE_WIDTH, TILE_HEIGHT)
+    symbols = {}  # Символ -> индекс типа
+    palette = []
+    hits = []
+    grid = []
+    grid_line = 0
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if grid_line:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            if grid and len(line) != len(grid[0]):
+                raise LevelError(path, number, f"строка сетки длиной {len(line)}, ожидалось {len(grid[0])}")
+            grid.append(line)
+            continue
+
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line == "grid:":
+            grid_line = number
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise LevelError(path, number, f"ожидалось 'ключ: значение', получено {line!r}")
+        key = key.strip()
+        fields = value.split()
+        try:
+            if key == "name":
+                name = value.strip()
+            elif key == "ball_speed":
+                vx, vy = map(float, fields)
+                ball_speed = (vx, vy)
+            elif key == "tile_size":
+                width, height = map(int, fields)
+                if width <= 0 or height <= 0:
+                    raise ValueError
+                tile_size = (width, height)
+            elif key.startswith("tile "):
+                symbol = key[5:].strip()
+                if len(symbol) != 1 or symbol in ".?#":
+                    raise LevelError(path, number, f"недопустимый символ плитки {symbol!r}")
+                if symbol in symbols:
+                    raise LevelError(path, number, f"плитка {symbol!r} объявлена повторно")
+                r, g, b, strength = map(int, fields)
+                if not all(0 <= c <= 255 for c in (r, g, b)) or not 1 <= strength <= 32767:
+                    raise ValueError
+                symbols[symbol] = len(palette)
+                palette.append((r, g, b))
+                hits.append(strength)
+            else:
+                raise LevelError(path, number, f"неизвестный ключ {key!r}")
+        except ValueError:
+            raise LevelError(path, number, f"неверное значение для {key!r}: {value.strip()!r}") from None
+
+    if ball_speed is None:
+        raise LevelError(path, 0, "не задана ball_speed")
+    if not palette:
+        raise LevelError(path, 0, "не объявлено ни одной плитки")
+    if len(palette) > MAX_TILE_TYPES:
+        raise LevelError(path, 0, f"больше {MAX_TILE_TYPES} типов плиток")
+    if not grid:
+        raise LevelError(path, grid_line, "пустая сетка")
+
+    codes = np.zeros(256, dtype=np.uint8)
+    known = np.zeros(256, dtype=bool)
+    known[ord(".")] = True
+    codes[ord("?")], known[ord("?")] = RANDOM_CELL, True
+    for symbol, index in symbols.items():
+        if ord(symbol) > 255:
+            raise LevelError(path, grid_line, f"символ плитки {symbol!r} вне Latin-1")
+        codes[ord(symbol)], known[ord(symbol)] = index + 1, True
+    try:
+        raw = np.frombuffer("".join(grid).encode("latin-1"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise LevelError(path, grid_line, "в сетке символы вне Latin-1") from None
+    if not known[raw].all():
+        bad = chr(raw[~known[raw]][0])
+        raise LevelError(path, grid_line, f"в сетке необъявленный символ {bad!r}")
+    cells = codes[raw].reshape(len(grid), len(grid[0]))
+    return Level(name, ball_speed, tile_size, palette, np.array(hits, dtype=np.int16), cells)
+
+
+def compile_level(level):
+    """Двоичное представление уровня: заголовок, типы плиток, имя и сетка."""
+    name = level.name.encode("utf-8")
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, level.rows, level.cols, *level.tile_size,
+                         *level.ball_speed, len(level.palette), len(name))]
+    parts += [TILE_TYPE.pack(*color, strength) for color, strength in zip(level.palette, level.hits.tolist())]
+    parts.append(name)
+    parts.append(np.ascontiguousarray(level.cells).tobytes())
+    return b"".join(parts)
+
+
+def read_compiled(buffer, path="<cache>"):
+    """Уровень из двоичного представления; сетка ссылается на buffer без копирования."""
+    if len(buffer) < HEADER.size:
+        raise LevelError(path, 0, "обрезанный заголовок")
+    magic, version, rows, cols, width, height, vx, vy, types, name_size = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise LevelError(path, 0, "неизвестный формат кэша")
+    offset = HEADER.size
+    palette = []
+    hits = []
+    for _ in range(types):
+        r, g, b, strength = TILE_TYPE.unpack_from(buffer, offset)
+        palette.append((r, g, b))
+        hits.append(strength)
+        offset += TILE_TYPE.size
+    name = bytes(buffer[offset:offset + name_size]).decode("utf-8")
+    offset += name_size
+    if len(buffer) != offset + rows * cols:
+        raise LevelError(path, 0, "размер сетки не совпадает с заголовком")
+    cells = np.frombuffer(buffer, dtype=np.uint8, count=rows * cols, offset=offset).reshape(rows, cols)
+    return Level(name, (vx, vy), (width, height), palette, np.array(hits, dtype=np.int16), cells)
+
+
+def cache_path(text_bytes, cache_dir=LEVEL_CACHE_DIR):
+    """Путь к кэшу уровня: имя - хэш содержимого и версии формата."""
+    digest = hashlib.sha1(text_bytes + b"\0%d" % FORMAT_VERSION).hexdigest()
+    return os.path.join(cache_dir, digest + ".bin")
+
+
+def load_level(path, cache_dir=LEVEL_CACHE_DIR):
+    """Загрузка уровня через двоичный кэш.
+
+    При попадании в кэш текст не разбирается: большие кэш-файлы
+    отображаются в память, маленькие читаются целиком. При промахе уровень
+    разбирается, проверяется и записывается в кэш; если каталог кэша
+    недоступен для записи, уровень просто используется из памяти.
+    """
+    with open(path, "rb") as file:
+        text_bytes = file.read()
+    cached = cache_path(text_bytes, cache_dir)
+    if os.path.exists(cached):
+        try:
+            return read_cached(cached)
+        except (OSError, LevelError):
+            pass  # Поврежденный кэш пересобирается
+
+    level = parse_level(text_bytes.decode("utf-8"), path)
+    data = compile_level(level)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = f"{cached}.{os.getpid()}.tmp"
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, cached)  # Другие процессы не увидят недописанный файл
+    except OSError:
+        pass
+    return level
+
+
+def read_cached(path):
+    """Чтение кэш-файла уровня (с отображением в память для больших)."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < LEVEL_MMAP_MIN_BYTES:
+            return read_compiled(file.read(), path)
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return read_compiled(buffer, path)
+
+
+def load_levels(directory=LEVELS_DIR, cache_dir=LEVEL_CACHE_DIR):
+    """Все уровни каталога в порядке имен файлов."""
+    names = sorted(name for name in os.listdir(directory) if name.endswith(LEVEL_EXTENSION))
+    if not names:
+        raise LevelError(directory, 0, "нет файлов уровней")
+    return [load_level(os.path.join(directory, name), cache_dir) for name in names]
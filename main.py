@@ -1,45 +1,114 @@
+import time
+
 import pygame
+from assets import AssetManager
 from game import Game
-from settings import WIDTH, HEIGHT, FPS
+from settings import WIDTH, HEIGHT, PROFILER_ENABLED, PROFILER_EXPORT, RENDER_BACKEND, SIM_THREAD, TELEMETRY_REPORT
 from menu import MainMenu
+from profiler import profiler
+from governor import governor
+from gcpolicy import gc_policy
+from scheduler import LoopScheduler
+from timestep import FixedTimestep
+from pipeline import SimPipeline
 
 def main():
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Batty Game")
+    report = PROFILER_ENABLED or TELEMETRY_REPORT  # Телеметрия в консоль - при профилировании или по настройке
+    assets = AssetManager()
+    assets.init_subsystems()
+    if RENDER_BACKEND == "gpu":
+        from gpu import GpuDisplay
+        screen = GpuDisplay("Batty Game").screen  # Холст для меню; игру рисуют текстуры
+    else:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Batty Game")
+    assets.start_loading()  # Звуки грузятся в фоне, пока показывается меню
 
-    clock = pygame.time.Clock()
+    scheduler = LoopScheduler()  # Ограничение FPS в игре и сон в меню и на паузе
+    timestep = FixedTimestep()  # Физика идет с постоянным шагом независимо от FPS
     menu = MainMenu(screen)
-    game = Game(screen)
+    game = Game(screen, assets.sounds)
+    pipeline = SimPipeline(game) if SIM_THREAD else None  # Физика в своем потоке
 
     current_state = "menu"  # Текущее состояние: "menu" или "game"
 
     running = True
+    last_time = time.perf_counter()
     while running:
+        now = time.perf_counter()
+        frame_time = now - last_time
+        last_time = now
+        profiler.begin_frame()
+        gc_policy.begin_frame()
+
         if current_state == "menu":
-            action = menu.handle_events()
-            menu.draw()
+            with profiler.phase("menu"):
+                action = menu.handle_events(scheduler.events())
+                menu.draw()
 
-            if action == "start_game":
+            if action in ("start_game", "start_endless"):
                 current_state = "game"
-                game.reset_game()  # Сброс игры перед началом
+                game.reset_game(endless=action == "start_endless")  # Сброс игры перед началом
+                timestep.reset()
             elif action == "quit":
                 running = False
 
         elif current_state == "game":
-            action = game.handle_events()
+            with profiler.phase("handle_events"):
+                action = game.handle_events(scheduler.events())
             if action == "menu":  # Если нажат ESC и выбрано "Да", вернуться в меню
+                game.save_replay()
+                menu.invalidate()
+                gc_policy.menu()  # Мусор игры собирается, пока в меню ничего не движется
                 current_state = "menu"
                 game.show_exit_dialog = False  # Сброс диалога
+            elif action is False:  # Окно закрыто во время игры
+                running = False
             else:
-                running = game.update()
-                game.draw()
+                if pipeline is not None:
+                    pipeline.set_inputs(game.poll_inputs())  # Клавиатуру опрашивает только главный поток
+                    with profiler.phase("update"):
+                        alpha = pipeline.sync()
+                else:
+                    with profiler.phase("update"):
+                        for _ in range(timestep.advance(frame_time)):
+                            running = game.update()
+                    alpha = timestep.alpha
+                if game.quit_requested:  # Окно закрыто на экране конца игры
+                    running = False
+                else:
+                    game.draw(alpha)
 
-                if game.lives == 0:  # Если игра окончена, вернуться в меню
+                if game.view.over:  # Если игра окончена, вернуться в меню
+                    menu.invalidate()
+                    gc_policy.menu()
                     current_state = "menu"
 
-        clock.tick(FPS)
+        assets.mark_frame()
+        if report:
+            assets.report_startup()
+        # Меню и пауза ничего не рисуют без ввода: ждем событие вместо отсчета кадров
+        idle = not menu.dirty if current_state == "menu" else game.idle
+        if current_state == "game" and not idle:
+            governor.observe(time.perf_counter() - now)  # Время работы кадра без ожидания
+        with profiler.phase("wait"):
+            scheduler.wait(idle)
+        if idle:
+            timestep.reset()
+            last_time = time.perf_counter()
+        profiler.end_frame()
+        gc_policy.end_frame()
 
+    if current_state == "game":
+        game.save_replay()
+    if pipeline is not None:
+        pipeline.stop()
+    if report:
+        scheduler.report()
+        governor.report()
+        gc_policy.report()
+    if PROFILER_EXPORT:
+        profiler.export(PROFILER_EXPORT)
     pygame.quit()
 
 if __name__ == "__main__":
@@ -1,21 +1,32 @@
 import pygame
 from settings import WIDTH, HEIGHT, WHITE, BLACK, FONT_SIZE
+from utils import text_cache
+from gpu import present
+from scheduler import REDRAW_EVENTS
 
 class MainMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.options = ["Начать игру", "Настройки", "Выход"]
+        self.options = ["Начать игру", "Бесконечная игра", "Настройки", "Выход"]
         self.selected_option = 0
         self.show_exit_dialog = False  # Показывать ли диалог выхода
         self.dialog_options = ["Да", "Нет"]
         self.selected_dialog_option = 0
+        self.dirty = True  # Меню перерисовывается только после изменений
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def invalidate(self):
+        """Следующий вызов draw() перерисует меню (после возврата из игры)."""
+        self.dirty = True
+
+    def handle_events(self, events=None):
+        """Обработка событий меню; events - уже полученные события, иначе очередь pygame."""
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return "quit"
+            if event.type in REDRAW_EVENTS:
+                self.dirty = True
             if event.type == pygame.KEYDOWN:
+                self.dirty = True
                 if self.show_exit_dialog:
                     # Обработка событий для диалога выхода
                     if event.key == pygame.K_LEFT:
@@ -37,31 +48,36 @@ class MainMenu:
                         if self.selected_option == 0:
                             return "start_game"
                         elif self.selected_option == 1:
-                            return "settings"
+                            return "start_endless"
                         elif self.selected_option == 2:
+                            return "settings"
+                        elif self.selected_option == 3:
                             self.show_exit_dialog = True  # Показать диалог выхода
                     elif event.key == pygame.K_ESCAPE:
                         self.show_exit_dialog = True  # Показать диалог выхода при нажатии ESC
         return None
 
     def draw(self):
+        if not self.dirty:
+            return
+        self.dirty = False
         self.screen.fill(BLACK)
         if self.show_exit_dialog:
             # Отрисовка диалога выхода
-            text_surface = self.font.render("Вы уверены, что хотите выйти?", True, WHITE)
+            text_surface = text_cache.render("Вы уверены, что хотите выйти?", WHITE, FONT_SIZE)
             text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
             self.screen.blit(text_surface, text_rect)
 
             for i, option in enumerate(self.dialog_options):
                 color = WHITE if i == self.selected_dialog_option else (128, 128, 128)
-                text_surface = self.font.render(option, True, color)
+                text_surface = text_cache.render(option, color, FONT_SIZE)
                 text_rect = text_surface.get_rect(center=(WIDTH // 2 + (i - 0.5) * 100, HEIGHT // 2 + 50))
                 self.screen.blit(text_surface, text_rect)
         else:
             # Отрисовка главного меню
             for i, option in enumerate(self.options):
                 color = WHITE if i == self.selected_option else (128, 128, 128)
-                text_surface = self.font.render(option, True, color)
+                text_surface = text_cache.render(option, color, FONT_SIZE)
                 text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + i * 50))
                 self.screen.blit(text_surface, text_rect)
-        pygame.display.flip()
\ No newline at end of file
+        present()
\ No newline at end of file
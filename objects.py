@@ -2,8 +2,11 @@
 
 import pygame
 import random
+import time
 from settings import *
 from utils import draw_text
+from sprites import sprite_cache
+from governor import governor
 
 class Bat:
     """Класс платформы."""
@@ -12,6 +15,7 @@ class Bat:
         self.height = BAT_HEIGHT
         self.speed = BAT_SPEED
         self.pos = [WIDTH // 2 - self.width // 2, HEIGHT - 50]
+        self.prev_pos = self.pos.copy()  # Позиция на предыдущем шаге (для интерполяции)
         self.jump = 0  # Анимация подпрыгивания
         self.color_index = 0  # Индекс текущего цвета
         self.colors = [
@@ -26,172 +30,187 @@ class Bat:
         self.color_timer = 0  # Таймер для смены цвета
         self.is_extended = False  # Флаг, указывающий, расширена ли платформа
 
-    def move_left(self):
+    def move_left(self, scale=1.0):
         """Движение платформы влево."""
         if self.pos[0] > 0:
-            self.pos[0] -= self.speed
+            self.pos[0] -= self.speed * scale
 
-    def move_right(self):
+    def move_right(self, scale=1.0):
         """Движение платформы вправо."""
         if self.pos[0] < WIDTH - self.width:
-            self.pos[0] += self.speed
+            self.pos[0] += self.speed * scale
 
     def update_color(self):
         """Обновление цвета платформы."""
         if self.is_extended:  # Обновляем цвет только если платформа расширена
-            if pygame.time.get_ticks() - self.color_timer > 100:  # Смена цвета каждые 100 мс
+            # Смена цвета каждые 100 мс; часы не от SDL: его таймер при быстром запуске не инициализирован
+            if time.perf_counter() - self.color_timer > 0.1:
                 self.color_index = (self.color_index + 1) % len(self.colors)
-                self.color_timer = pygame.time.get_ticks()
+                self.color_timer = time.perf_counter()
 
-    def draw(self, screen):
-        """Отрисовка платформы."""
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка платформы (alpha - доля шага для интерполяции).
+
+        Возвращает прямоугольник, который был перерисован.
+        """
         self.update_color()  # Обновляем цвет
         color = self.colors[self.color_index] if self.is_extended else WHITE
         # Используем белый цвет, если платформа не расширена
-        pygame.draw.rect(screen, self.colors[self.color_index],
-                         (self.pos[0], self.pos[1] - self.jump, self.width, self.height))
-
-
-class Ball:
-    """Класс мяча."""
-    def __init__(self):
-        self.radius = BALL_RADIUS
-        self.speed = BALL_SPEED.copy()
-        self.pos = [WIDTH // 2, HEIGHT // 2]
-
-    def update(self):
-        """Обновление позиции мяча."""
-        self.pos[0] += self.speed[0]
-        self.pos[1] += self.speed[1]
-
-    def draw(self, screen):
-        """Отрисовка мяча."""
-        pygame.draw.circle(screen, RED, (int(self.pos[0]), int(self.pos[1])), self.radius)
+        return pygame.draw.rect(screen, self.colors[self.color_index], self.interpolated_rect(alpha))
 
-
-class Tile:
-    """Класс плитки."""
-    def __init__(self, x, y, color, hits=1):
-        self.rect = pygame.Rect(x, y, TILE_WIDTH, TILE_HEIGHT)
-        self.color = color
-        self.hits = hits  # Количество ударов для разрушения
-        self.active = True
-
-    def draw(self, screen):
-        """Отрисовка плитки."""
-        if self.active:
-            pygame.draw.rect(screen, self.color, self.rect)
-            if self.hits > 1:
-                draw_text(screen, str(self.hits), self.rect.centerx, self.rect.centery - 5, font_size=20)
+    def interpolated_rect(self, alpha=1.0):
+        """Прямоугольник платформы между двумя последними шагами: (x, y, ширина, высота)."""
+        x = self.prev_pos[0] + (self.pos[0] - self.prev_pos[0]) * alpha
+        return x, self.pos[1] - self.jump, self.width, self.height
 
 
 class Bonus:
     """Класс бонуса."""
-    def __init__(self):
+    def __init__(self, rng=random):
         self.radius = BONUS_RADIUS
-        self.pos = [random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 200)]
+        self.place(rng)
         self.active = False
         self.animation_counter = 0
 
+    def place(self, rng):
+        """Случайное положение бонуса на поле."""
+        self.pos = [rng.randint(50, WIDTH - 50), rng.randint(50, HEIGHT - 200)]
+
+    def next_color(self):
+        """Цвет бонуса в очередном кадре анимации мигания."""
+        self.animation_counter += 1
+        if self.animation_counter >= BONUS_ANIMATION_FRAMES:
+            self.animation_counter = 0
+        return GREEN if self.animation_counter < BONUS_ANIMATION_FRAMES // 2 else BLUE
+
+    def sprite(self):
+        """Спрайт очередного кадра анимации и его позиция для Surface.blits() или None.
+
+        Оба кадра мигания (зеленый и синий круг) берутся из кэша спрайтов.
+        """
+        if not self.active:
+            return None
+        radius = self.radius
+        return sprite_cache.circle(radius, self.next_color()), (int(self.pos[0]) - radius, int(self.pos[1]) - radius)
+
     def draw(self, screen):
         """Отрисовка бонуса."""
-        if self.active:
-            self.animation_counter += 1
-            if self.animation_counter >= BONUS_ANIMATION_FRAMES:
-                self.animation_counter = 0
-            color = GREEN if self.animation_counter < BONUS_ANIMATION_FRAMES // 2 else BLUE
-            pygame.draw.circle(screen, color, (int(self.pos[0]), int(self.pos[1])), self.radius)
-
-class BonusText:
+        sprite = self.sprite()
+        if sprite is not None:
+            return screen.blit(*sprite)
+        return None
+
+
+class ParticleEmitter:
+    """Базовый эмиттер частиц.
+
+    Сами частицы живут в общей ParticleSystem; эмиттер лишь помнит, на каком
+    кадре системы умрет его последняя частица. Завершившиеся эмиттеры
+    возвращаются в EmitterPool и запускаются заново методом start().
+    """
+    def __init__(self, particles, *args):
+        self.particles = particles
+        self.start(*args)
+
+    def start(self, *args):
+        """Запуск эффекта; вызывается и для эмиттера, взятого из пула."""
+        self.end_frame = None
+
+    def emit(self, x, y, amount, life, spread=0):
+        """Выпуск частиц в общую систему."""
+        self.particles.emit(x, y, amount, life, spread)
+        self.end_frame = self.particles.frame + life
+
+    @property
+    def finished(self):
+        """Все частицы эмиттера умерли."""
+        return self.end_frame is not None and self.particles.frame >= self.end_frame
+
+
+class BonusText(ParticleEmitter):
     """Класс для отображения текста бонуса и его анимации."""
-    def __init__(self, x, y, text):
+    def start(self, x, y, text):
+        super().start()
         self.x = x
         self.y = y
         self.text = text
-        self.timer = pygame.time.get_ticks() + 2000  # Таймер на 2 секунды
-        self.particles = []  # Частицы для анимации рассыпания
+        self.explode_frame = self.particles.frame + 2 * TICK_RATE  # 2 секунды игрового времени (кадры частиц - тики)
         self.is_exploded = False  # Флаг, указывающий, началась ли анимация рассыпания
 
     def explode(self):
         """Создает частицы для анимации рассыпания текста."""
-        for i in range(len(self.text) * 10):  # Создаем частицы для каждой буквы
-            self.particles.append({
-                "pos": [self.x + random.randint(-50, 50), self.y + random.randint(-50, 50)],
-                "speed": [random.uniform(-2, 2), random.uniform(-2, 2)],
-                "color": (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)),
-                "life": 60  # Время жизни частицы
-            })
+        # Частицы для каждой буквы, время жизни 60 кадров
+        self.emit(self.x, self.y, governor.scale(len(self.text) * 10), 60, spread=50)
         self.is_exploded = True
 
     def update(self):
-        """Обновление состояния текста и частиц."""
-        if not self.is_exploded and pygame.time.get_ticks() >= self.timer:
+        """Обновление состояния текста."""
+        if not self.is_exploded and self.particles.frame >= self.explode_frame:
             self.explode()  # Запускаем анимацию рассыпания
 
-        for particle in self.particles:
-            particle["pos"][0] += particle["speed"][0]
-            particle["pos"][1] += particle["speed"][1]
-            particle["life"] -= 1
-
     def draw(self, screen):
-        """Отрисовка текста и частиц."""
+        """Отрисовка текста (частицы рисует общая система)."""
         if not self.is_exploded:
-            # Отрисовка текста
-            draw_text(screen, self.text, self.x, self.y, font_size=30)
-        else:
-            # Отрисовка частиц
-            for particle in self.particles:
-                if particle["life"] > 0:
-                    pygame.draw.circle(screen, particle["color"],
-                                       (int(particle["pos"][0]), int(particle["pos"][1])), 3)
-
-class TileExplosion:
-    """Класс анимации разрушения плитки."""
-    def __init__(self, x, y):
-        self.particles = []
-        for _ in range(20):  # 20 частиц
-            self.particles.append({
-                "pos": [x, y],
-                "speed": [random.uniform(-2, 2), random.uniform(-2, 2)],
-                "color": (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)),
-                "life": 30
-            })
+            return draw_text(screen, self.text, self.x, self.y, font_size=30)
+        return None
 
-    def update(self):
-        """Обновление частиц."""
-        for particle in self.particles:
-            particle["pos"][0] += particle["speed"][0]
-            particle["pos"][1] += particle["speed"][1]
-            particle["life"] -= 1
 
-    def draw(self, screen):
-        """Отрисовка частиц."""
-        for particle in self.particles:
-            if particle["life"] > 0:
-                pygame.draw.circle(screen, particle["color"], (int(particle["pos"][0]), int(particle["pos"][1])), 3)
+class TileExplosion(ParticleEmitter):
+    """Класс анимации разрушения плитки."""
+    def start(self, x, y):
+        super().start()
+        self.emit(x, y, governor.scale(20), 30)  # 20 частиц при полном качестве
 
 
-class BonusEffect:
+class BonusEffect(ParticleEmitter):
     """Класс эффекта бонуса."""
-    def __init__(self, x, y):
-        self.particles = []
-        for _ in range(20):  # 20 частиц
-            self.particles.append({
-                "pos": [x, y],
-                "speed": [random.uniform(-2, 2), random.uniform(-2, 2)],
-                "color": (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)),
-                "life": 30
-            })
-
-    def update(self):
-        """Обновление частиц."""
-        for particle in self.particles:
-            particle["pos"][0] += particle["speed"][0]
-            particle["pos"][1] += particle["speed"][1]
-            particle["life"] -= 1
-
-    def draw(self, screen):
-        """Отрисовка частиц."""
-        for particle in self.particles:
-            if particle["life"] > 0:
-                pygame.draw.circle(screen, particle["color"], (int(particle["pos"][0]), int(particle["pos"][1])), 3)
\ No newline at end of file
+    def start(self, x, y):
+        super().start()
+        self.emit(x, y, governor.scale(20), 30)  # 20 частиц при полном качестве
+
+
+class EmitterPool:
+    """Пул эмиттеров частиц.
+
+    Эмиттеры создаются на каждое разрушение плитки и бонус; вместо того
+    чтобы отдавать завершившиеся объекты сборщику мусора, пул хранит их по
+    классам и запускает заново. Списки активных эмиттеров чистятся на месте
+    в retire(), без создания новых списков каждый кадр.
+    """
+    def __init__(self, particles):
+        self.particles = particles
+        self.free = {}  # Класс эмиттера -> свободные объекты
+        self.created = 0  # Сколько эмиттеров пришлось создать
+        self.reused = 0
+
+    def acquire(self, cls, *args):
+        """Запущенный эмиттер класса cls: из пула или новый."""
+        free = self.free.get(cls)
+        if free:
+            emitter = free.pop()
+            emitter.start(*args)
+            self.reused += 1
+            return emitter
+        self.created += 1
+        return cls(self.particles, *args)
+
+    def release(self, emitter):
+        """Возврат эмиттера в пул."""
+        self.free.setdefault(type(emitter), []).append(emitter)
+
+    def retire(self, emitters):
+        """Удаление завершившихся эмиттеров из списка на месте с возвратом в пул."""
+        keep = 0
+        for emitter in emitters:
+            if emitter.finished:
+                self.release(emitter)
+            else:
+                emitters[keep] = emitter
+                keep += 1
+        del emitters[keep:]
+
+    def release_all(self, emitters):
+        """Возврат в пул всех эмиттеров списка (после сброса эффектов)."""
+        for emitter in emitters:
+            self.release(emitter)
+        emitters.clear()
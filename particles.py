@@ -0,0 +1,105 @@
+# particles.py
+
+import numpy as np
+import pygame
+from settings import *
+from sprites import sprite_cache, PARTICLE_COLORS
+
+
+class ParticleSystem:
+    """Общая система частиц на массивах NumPy.
+
+    Позиции, скорости, цвета и время жизни всех частиц хранятся в непрерывных
+    массивах фиксированной емкости. Живые частицы всегда занимают префикс
+    [0, count): интегрирование выполняется одной векторной операцией, а
+    умершие частицы удаляются заменой на последние живые, так что на каждую
+    умершую частицу приходится O(1) работы и память не перевыделяется.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, rng=None):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.color_index = np.zeros(capacity, dtype=np.uint16)  # Номер цвета в PARTICLE_COLORS
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.count = 0  # Количество живых частиц
+        self.frame = 0  # Номер кадра системы, по нему эмиттеры узнают о завершении
+        self.dropped = 0  # Частицы, не поместившиеся в пул
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Ограничивающий прямоугольник, обновляется на месте
+
+    def emit(self, x, y, amount, life, spread=0):
+        """Создает amount частиц в точке (x, y) и возвращает число созданных.
+
+        spread задает случайный разброс начальной позиции по каждой оси.
+        """
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return 0
+        start, end = self.count, self.count + amount
+        pos = self.pos[start:end]
+        pos[:, 0] = x
+        pos[:, 1] = y
+        if spread:
+            pos += self.rng.integers(-spread, spread + 1, size=(amount, 2))
+        self.vel[start:end] = self.rng.uniform(-2, 2, size=(amount, 2))
+        index = self.rng.integers(0, len(PARTICLE_COLORS), size=amount)
+        self.color_index[start:end] = index
+        self.color[start:end] = PARTICLE_COLORS[index]
+        self.life[start:end] = life
+        self.count = end
+        return amount
+
+    def update(self):
+        """Интегрирование всех частиц и удаление умерших."""
+        self.frame += 1
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.life[:n] -= 1
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size == 0:
+            return
+        alive_count = n - dead.size
+        # Дыры в сохраняемом префиксе заполняются живыми частицами из хвоста
+        holes = dead[dead < alive_count]
+        if holes.size:
+            tail = np.arange(alive_count, n)
+            movers = tail[self.life[alive_count:n] > 0]
+            for array in (self.pos, self.vel, self.color, self.color_index, self.life):
+                array[holes] = array[movers]
+        self.count = alive_count
+
+    def sprites(self, radius=3, step=1):
+        """Спрайты живых частиц для Surface.blits() (при step > 1 - только каждой step-й).
+
+        Возвращает (последовательность (поверхность, позиция), ограничивающий
+        прямоугольник) или (None, None), если частиц нет.
+        """
+        n = self.count
+        if n == 0:
+            return None, None
+        points = self.pos[:n:step].astype(np.int32)
+        corners = points - radius
+        sprites = sprite_cache.particle_sprites(radius)[self.color_index[:n:step]]
+        left, top = corners.min(axis=0)
+        right, bottom = points.max(axis=0) + radius + 1
+        rect = self.rect
+        rect.update(int(left), int(top), int(right - left), int(bottom - top))
+        return zip(sprites.tolist(), corners.tolist()), rect
+
+    def draw(self, screen, radius=3, step=1):
+        """Отрисовка живых частиц одним вызовом Surface.blits().
+
+        Возвращает общий ограничивающий прямоугольник частиц или None.
+        """
+        batch, rect = self.sprites(radius, step)
+        if batch is not None:
+            screen.blits(batch, doreturn=False)
+        return rect
+
+    def clear(self):
+        """Удаление всех частиц."""
+        self.count = 0
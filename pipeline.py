@@ -0,0 +1,263 @@
+# pipeline.py
+
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from settings import *
+from simulation import Simulation, InputState
+from snapshot import take_snapshot, restore_snapshot
+from timestep import FixedTimestep
+
+# Кадр состояния от потока симуляции: тик, момент публикации (perf_counter),
+# снимок take_snapshot(), события и число шагов с прошлого прочитанного кадра
+StateFrame = namedtuple("StateFrame", "tick time data events steps")
+
+PAUSED_INPUTS = InputState(False, False, True, False)
+
+
+class FrameMailbox:
+    """Обмен кадрами состояния между потоком симуляции и главным потоком.
+
+    Тройной буфер на неизменяемых объектах: писатель собирает новый кадр у
+    себя (задний буфер), под коротким замком кладет его в общий слот, а
+    читатель забирает слот себе (передний буфер). Никто не ждет другого
+    дольше обмена ссылкой. Если читатель не успел забрать кадр, новый кадр
+    его заменяет, но события и число шагов складываются, чтобы не потерять
+    ни звуки, ни частицы.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = None
+        self.published = 0
+        self.consumed = 0
+        self.replaced = 0  # Кадры, замененные до прочтения
+
+    def publish(self, frame):
+        """Публикация кадра (поток симуляции)."""
+        with self.lock:
+            pending = self.latest
+            if pending is not None:
+                frame = frame._replace(events=pending.events + frame.events, steps=pending.steps + frame.steps)
+                self.replaced += 1
+            self.latest = frame
+            self.published += 1
+
+    def consume(self):
+        """Последний кадр или None, если нового нет (главный поток)."""
+        with self.lock:
+            frame = self.latest
+            self.latest = None
+        if frame is not None:
+            self.consumed += 1
+        return frame
+
+
+class SimPipeline:
+    """Конвейер: симуляция в своем потоке, ввод и отрисовка в главном.
+
+    Поток симуляции шагает game.sim с фиксированным шагом и после каждой
+    пачки шагов публикует компактный снимок состояния (несколько килобайт,
+    см. snapshot.py) в FrameMailbox. Главный поток опрашивает клавиатуру
+    (SDL требует этого от главного потока), передает ввод в поток симуляции,
+    восстанавливает последний снимок в отдельную симуляцию game.view и
+    рисует ее. Сетка плиток view обновляется на месте, поэтому отрисовщик
+    перерисовывает только изменившиеся плитки. Медленный flip() больше не
+    задерживает шаги физики, а кадр главного потока сокращается до
+    восстановления снимка и отрисовки.
+
+    Сброс, перемотка, перезапуск и сохранение повтора выполняются в потоке
+    симуляции между шагами через call(): Game вызывает их через on_sim().
+    """
+    def __init__(self, game):
+        self.game = game
+        sim = game.sim
+        self.tick_rate = sim.tick_rate
+        game.view = Simulation(tick_rate=sim.tick_rate, levels=sim.levels)
+        restore_snapshot(game.view, take_snapshot(sim))
+        game.pipeline = self
+        self.mailbox = FrameMailbox()
+        self.inputs = PAUSED_INPUTS  # Ввод для следующих тиков; меняется главным потоком
+        self.active = False  # Идет ли игра (не меню и не пауза)
+        self.wake = threading.Event()
+        self.commands = queue.SimpleQueue()
+        self.frame_time = time.perf_counter()  # Момент публикации кадра, который на экране
+        self.steps = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def set_inputs(self, inputs, active=True):
+        """Ввод для следующих тиков; active=False - игра стоит (меню)."""
+        self.inputs = inputs
+        self.active = active and not (inputs.pause or inputs.escape)
+        if self.active:
+            self.wake.set()
+
+    def call(self, action):
+        """Выполнение action в потоке симуляции между шагами с ожиданием результата.
+
+        Состояние после действия сразу применяется к view.
+        """
+        if threading.current_thread() is self.thread:
+            return action()
+        done = threading.Event()
+        outcome = []
+        self.commands.put((action, done, outcome))
+        self.wake.set()
+        done.wait()
+        self.sync()
+        result, error = outcome
+        if error is not None:
+            raise error
+        return result
+
+    def run_commands(self):
+        """Команды главного потока; после каждой публикуется свежий кадр."""
+        while True:
+            try:
+                action, done, outcome = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                outcome += [action(), None]
+            except Exception as error:
+                outcome += [None, error]
+            self.publish((), 0)
+            done.set()
+
+    def publish(self, events, steps):
+        sim = self.game.sim
+        self.mailbox.publish(StateFrame(sim.tick, time.perf_counter(), take_snapshot(sim), tuple(events), steps))
+
+    def run(self):
+        """Цикл потока симуляции."""
+        game = self.game
+        timestep = FixedTimestep(self.tick_rate)
+        last = time.perf_counter()
+        while self.running:
+            self.run_commands()
+            if not self.active or game.sim.over:
+                # Меню, пауза или конец игры: спим до ввода или команды
+                self.wake.wait()
+                self.wake.clear()
+                timestep.reset()
+                last = time.perf_counter()
+                continue
+            now = time.perf_counter()
+            steps = timestep.advance(now - last)
+            last = now
+            events = []
+            for _ in range(steps):
+                events += game.step(self.inputs)
+            if steps:
+                self.steps += steps
+                self.publish(events, steps)
+            time.sleep(max(0.0, timestep.dt - timestep.accumulator))  # До следующего тика
+
+    def sync(self):
+        """Применение последнего кадра к view и эффектам. Возвращает alpha для интерполяции."""
+        frame = self.mailbox.consume()
+        if frame is not None:
+            game = self.game
+            changed = restore_snapshot(game.view, frame.data, reuse_tiles=True)
+            if changed is not None and game.renderer is not None:
+                for cell in changed.tolist():
+                    game.renderer.patch_tile(cell)
+            self.frame_time = frame.time
+            game.present(frame.events, frame.steps)
+        return min(1.0, (time.perf_counter() - self.frame_time) * self.tick_rate)
+
+    def stop(self):
+        """Остановка потока симуляции."""
+        self.running = False
+        self.wake.set()
+        self.thread.join()
+
+    def stats(self):
+        mailbox = self.mailbox
+        return {"steps": self.steps, "published": mailbox.published,
+                "consumed": mailbox.consumed, "replaced": mailbox.replaced}
+
+
+def measure(pipelined, seconds=5.0, balls=0, flip_ms=0.0, seed=1):
+    """Замер главного цикла игры с ограничением FPS на dummy-драйвере SDL.
+
+    balls - сколько мячей добавить, чтобы нагрузить симуляцию; flip_ms -
+    искусственная задержка вывода кадра (медленный драйвер или ожидание
+    vsync; сон, как и настоящий flip(), отпускает GIL). Возвращает среднее
+    и 95-й перцентиль работы кадра главного потока (опрос ввода, шаги или
+    восстановление снимка, отрисовка, вывод), 99-й перцентиль и максимум
+    промежутка между шагами физики (при ровном ходе - 1 / TICK_RATE) и
+    число шагов физики в секунду.
+    """
+    import numpy as np
+    import pygame
+    from game import Game
+    from batch import autopilot
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    game = Game(screen, sounds={}, record=False)
+    game.reset_game(seed)
+    game.sim.lives = 10 ** 9
+    for _ in range(balls):
+        game.sim.balls.add(WIDTH // 2, HEIGHT // 2, 3.0, -3.0)
+    stamps = []  # Моменты шагов физики
+    step = game.step
+    game.step = lambda inputs: stamps.append(time.perf_counter()) or step(inputs)
+    pipeline = SimPipeline(game) if pipelined else None
+    timestep = FixedTimestep(game.sim.tick_rate)
+    clock = pygame.time.Clock()
+
+    frames = []
+    start = last = time.perf_counter()
+    while last - start < seconds:
+        now = time.perf_counter()
+        pygame.event.pump()
+        inputs = autopilot(game.view, BATCH_DEADZONE)
+        if pipeline is not None:
+            pipeline.set_inputs(inputs)
+            alpha = pipeline.sync()
+        else:
+            for _ in range(timestep.advance(now - last)):
+                game.update(inputs)
+            alpha = timestep.alpha
+        game.draw(alpha)
+        time.sleep(flip_ms / 1000)
+        frames.append(time.perf_counter() - now)
+        last = now
+        clock.tick(FPS)
+    elapsed = time.perf_counter() - start
+    if pipeline is not None:
+        pipeline.stop()
+    pygame.quit()
+    frames = np.array(frames) * 1000
+    gaps = np.diff(stamps) * 1000
+    return {"frame_ms": frames.mean(), "frame_p95_ms": np.percentile(frames, 95),
+            "tick_gap_p99_ms": np.percentile(gaps, 99), "tick_gap_max_ms": gaps.max(),
+            "ticks_per_second": len(stamps) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение последовательного и конвейерного цикла")
+    parser.add_argument("--seconds", type=float, default=5.0, help="длительность каждого замера")
+    parser.add_argument("--balls", type=int, default=0, help="дополнительные мячи для нагрузки симуляции")
+    parser.add_argument("--flip-ms", type=float, default=0.0, help="искусственная задержка вывода кадра")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    for pipelined in (False, True):
+        result = measure(pipelined, args.seconds, args.balls, args.flip_ms)
+        print(f"{'конвейер' if pipelined else 'последовательно'}: "
+              f"кадр {result['frame_ms']:.2f} мс (p95 {result['frame_p95_ms']:.2f}), "
+              f"промежуток между шагами p99 {result['tick_gap_p99_ms']:.1f} мс "
+              f"(макс. {result['tick_gap_max_ms']:.1f}), {result['ticks_per_second']:.0f} тиков/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# profiler.py
+
+import csv
+import json
+from time import perf_counter
+
+import numpy as np
+import pygame
+from settings import *
+from utils import draw_text
+
+
+class PhaseTimer:
+    """Замер одной фазы кадра; используется как контекстный менеджер."""
+    __slots__ = ("profiler", "column", "start")
+
+    def __init__(self, profiler, column):
+        self.profiler = profiler
+        self.column = column
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.current[self.column] += perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """Профилировщик кадра по фазам.
+
+    Длительности фаз складываются в строку текущего кадра, а в end_frame()
+    строка копируется в кольцевой буфер последних capacity кадров. Нулевой
+    столбец - полное время кадра. Таймеры фаз создаются один раз на имя, так
+    что замер не выделяет память.
+    """
+    def __init__(self, capacity=PROFILER_HISTORY, max_phases=32):
+        self.capacity = capacity
+        self.names = ["frame"]
+        self.timers = {}
+        self.samples = np.zeros((capacity, max_phases), dtype=np.float64)
+        self.current = np.zeros(max_phases, dtype=np.float64)
+        self.position = 0  # Следующая строка кольцевого буфера
+        self.filled = 0  # Количество заполненных строк
+        self.frame_start = None
+        self.overlay = False  # Показывать ли оверлей
+        self.overlay_lines = []  # Строки оверлея, обновляются раз в PROFILER_OVERLAY_REFRESH кадров
+        self.frames_since_refresh = 0
+
+    def phase(self, name):
+        """Таймер фазы name: with profiler.phase("draw"): ..."""
+        timer = self.timers.get(name)
+        if timer is None:
+            if len(self.names) == self.current.size:
+                raise ValueError("Слишком много фаз профилировщика")
+            timer = PhaseTimer(self, len(self.names))
+            self.names.append(name)
+            self.timers[name] = timer
+        return timer
+
+    def begin_frame(self):
+        """Начало кадра."""
+        self.frame_start = perf_counter()
+
+    def end_frame(self):
+        """Конец кадра: сохранение замеров в кольцевой буфер."""
+        if self.frame_start is None:
+            return
+        self.current[0] = perf_counter() - self.frame_start
+        self.samples[self.position] = self.current
+        self.current[:] = 0.0
+        self.position = (self.position + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+        self.frame_start = None
+
+    def history(self):
+        """Замеры в хронологическом порядке: массив (кадры, фазы) в секундах."""
+        columns = len(self.names)
+        if self.filled < self.capacity:
+            return self.samples[:self.filled, :columns]
+        return np.roll(self.samples, -self.position, axis=0)[:, :columns]
+
+    def clear(self):
+        """Сброс накопленных замеров (например, после прогрева)."""
+        self.current[:] = 0.0
+        self.position = 0
+        self.filled = 0
+        self.frame_start = None
+
+    def summary(self):
+        """Перцентили p50/p95/p99 и среднее для каждой фазы в миллисекундах."""
+        data = self.history() * 1000.0
+        result = {}
+        if len(data) == 0:
+            return result
+        p50, p95, p99 = np.percentile(data, [50, 95, 99], axis=0)
+        means = data.mean(axis=0)
+        for column, name in enumerate(self.names):
+            result[name] = {
+                "p50": float(p50[column]),
+                "p95": float(p95[column]),
+                "p99": float(p99[column]),
+                "mean": float(means[column]),
+            }
+        return result
+
+    def export(self, path):
+        """Выгрузка замеров в CSV или JSON (по расширению файла)."""
+        data = self.history() * 1000.0
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({
+                    "phases": self.names,
+                    "unit": "ms",
+                    "summary": self.summary(),
+                    "frames": data.round(4).tolist(),
+                }, file, ensure_ascii=False, indent=1)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(self.names)
+                writer.writerows(data.round(4).tolist())
+
+    def toggle_overlay(self):
+        """Включение и выключение оверлея."""
+        self.overlay = not self.overlay
+        self.frames_since_refresh = PROFILER_OVERLAY_REFRESH
+
+    def draw_overlay(self, screen):
+        """Оверлей с перцентилями времени кадра и графиком последних кадров.
+
+        Возвращает занятый прямоугольник или None, если оверлей выключен.
+        """
+        if not self.overlay or self.filled == 0:
+            return None
+        self.frames_since_refresh += 1
+        if self.frames_since_refresh >= PROFILER_OVERLAY_REFRESH:
+            self.frames_since_refresh = 0
+            self.overlay_lines = [
+                f"{name}: {stats['p50']:.2f} / {stats['p95']:.2f} / {stats['p99']:.2f} мс"
+                for name, stats in self.summary().items()
+            ]
+
+        x, y = 10, 40
+        area = pygame.Rect(x, y, 300, 16 * len(self.overlay_lines) + 50)
+        screen.fill(BLACK, area)
+        for i, line in enumerate(self.overlay_lines):
+            draw_text(screen, line, x + 4, y + 4 + i * 16, font_size=18)
+
+        # График времени последних кадров, бюджет кадра - середина по высоте
+        frames = self.history()[-area.width:, 0]
+        if len(frames) > 1:
+            budget = 1.0 / (FPS or TICK_RATE)
+            base = area.bottom - 4
+            heights = np.minimum(frames / budget * 20, 40).astype(np.int32)
+            points = [(area.left + i, base - int(h)) for i, h in enumerate(heights.tolist())]
+            pygame.draw.line(screen, (128, 128, 128), (area.left, base - 20), (area.right, base - 20))
+            pygame.draw.lines(screen, GREEN, False, points)
+        return area
+
+
+class NullTimer:
+    """Пустой таймер для отключенного профилировщика."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """Отключенный профилировщик: все вызовы ничего не делают."""
+    overlay = False
+    timer = NullTimer()
+
+    def phase(self, name):
+        return self.timer
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def summary(self):
+        return {}
+
+    def export(self, path):
+        pass
+
+    def toggle_overlay(self):
+        pass
+
+    def draw_overlay(self, screen):
+        return None
+
+
+profiler = FrameProfiler() if PROFILER_ENABLED else NullProfiler()
@@ -0,0 +1,99 @@
+# renderer.py
+
+import pygame
+from settings import *
+from profiler import profiler
+from governor import governor
+
+
+class RetainedRenderer:
+    """Отрисовка с кэшированным слоем плиток и грязными прямоугольниками.
+
+    Плитки один раз рисуются во внеэкранный слой и перерисовываются в нем
+    только при ударе или разрушении. Каждый кадр на экране восстанавливаются
+    из слоя лишь те области, где в прошлом кадре были подвижные объекты,
+    и на дисплей отправляются только измененные прямоугольники через
+    pygame.display.update(rects) вместо полного flip(). На ступенях качества
+    с hud_on_change полоса интерфейса тоже живет в слое и обновляется только
+    при изменении очков, жизней или уровня.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.screen = game.screen
+        self.screen_rect = self.screen.get_rect()
+        self.layer = pygame.Surface(self.screen.get_size())  # Фон с плитками
+        self.tiles = None  # Набор плиток, по которому построен слой
+        self.dirty = []  # Прямоугольники подвижных объектов прошлого кадра
+        self.patched = []  # Прямоугольники плиток, измененных после прошлого кадра
+        self.full_redraw = True
+        self.hud_rect = pygame.Rect(0, 0, WIDTH, HUD_HEIGHT)
+        self.hud_in_layer = False  # Полоса интерфейса нарисована в слое
+
+    def rebuild(self):
+        """Полная перерисовка слоя плиток."""
+        self.layer.fill(BLACK)
+        self.tiles.draw(self.layer)
+        self.hud_in_layer = False
+        self.full_redraw = True
+
+    def update_hud(self):
+        """Полоса интерфейса в слое: перерисовка при изменении значений или ступени качества."""
+        if governor.quality["hud_on_change"]:
+            surface, _, changed = self.game.render_hud()
+            if not changed and self.hud_in_layer:
+                return
+            self.layer.fill(BLACK, self.hud_rect)
+            self.layer.blit(surface, self.hud_rect)
+            self.hud_in_layer = True
+        elif self.hud_in_layer:
+            self.layer.fill(BLACK, self.hud_rect)
+            self.hud_in_layer = False
+        else:
+            return
+        self.patched.append(self.hud_rect)
+
+    def patch_tile(self, cell):
+        """Перерисовка одной плитки в слое после удара."""
+        tiles = self.game.tiles
+        rect = tiles.rect(cell)
+        self.layer.fill(BLACK, rect)
+        if cell in tiles:
+            tiles.draw_tile(self.layer, cell)
+        self.patched.append(rect)
+
+    def invalidate(self):
+        """Следующий кадр будет выведен целиком (после меню или экрана конца игры)."""
+        self.full_redraw = True
+
+    def invalidate_tiles(self):
+        """Слой плиток будет перестроен (все плитки сдвинулись)."""
+        self.tiles = None
+
+    def draw(self, alpha=1.0):
+        """Отрисовка кадра."""
+        if self.game.tiles is not self.tiles:
+            self.tiles = self.game.tiles
+            self.patched = []
+            self.rebuild()
+        self.update_hud()
+
+        screen = self.screen
+        with profiler.phase("draw_restore"):
+            if self.full_redraw:
+                screen.blit(self.layer, (0, 0))
+            else:
+                for rect in self.dirty:
+                    screen.blit(self.layer, rect, rect)
+                for rect in self.patched:
+                    screen.blit(self.layer, rect, rect)
+
+        drawn = self.game.draw_dynamic(alpha, hud=not self.hud_in_layer)
+        rects = [rect.clip(self.screen_rect) for rect in drawn if rect is not None]
+        with profiler.phase("flip"):
+            if self.full_redraw:
+                pygame.display.flip()
+                self.full_redraw = False
+            else:
+                pygame.display.update(self.dirty + self.patched + rects)
+        self.dirty = rects
+        self.patched = []
@@ -0,0 +1,246 @@
+# replay.py
+
+import argparse
+import struct
+import time
+
+from settings import *
+from simulation import Simulation, InputState
+
+# Файл повтора: заголовок, затем серии одинакового ввода (длина varint + байт
+# с битами клавиш), затем контрольные суммы состояния каждые interval тиков.
+MAGIC = b"BRPL"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHQHHIII?")  # magic, версия, seed, tick_rate, interval, тиков, серий, сумм, бесконечный режим
+
+
+def pack_inputs(inputs):
+    """Ввод тика в байт: биты влево, вправо, пауза, диалог выхода."""
+    return (bool(inputs.left) | bool(inputs.right) << 1
+            | bool(inputs.pause) << 2 | bool(inputs.escape) << 3)
+
+
+def unpack_inputs(bits):
+    """Обратное преобразование байта в InputState."""
+    return InputState(bool(bits & 1), bool(bits & 2), bool(bits & 4), bool(bits & 8))
+
+
+def write_varint(out, value):
+    """Беззнаковое число в формате varint (7 бит на байт)."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """Чтение varint. Возвращает (значение, новое смещение)."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayRecorder:
+    """Запись сида и ввода каждого тика симуляции.
+
+    Ввод меняется редко, поэтому хранятся только серии одинаковых состояний
+    клавиш: минута игры с удержанием стрелок занимает десятки байт.
+    Каждые interval тиков дополнительно пишется контрольная сумма состояния.
+    """
+    def __init__(self, seed, tick_rate=TICK_RATE, interval=REPLAY_CHECKSUM_INTERVAL, endless=False):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.interval = interval
+        self.endless = endless
+        self.runs = []  # [биты ввода, число тиков подряд]
+        self.checksums = []
+        self.ticks = 0
+
+    def record(self, sim, inputs):
+        """Запись одного шага; вызывается сразу после sim.step(inputs)."""
+        bits = pack_inputs(inputs)
+        if self.runs and self.runs[-1][0] == bits:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+        self.ticks += 1
+        if self.ticks % self.interval == 0:
+            self.checksums.append(sim.checksum())
+
+    def truncate(self, ticks):
+        """Отбрасывание записи после тика ticks (после перемотки назад)."""
+        drop = self.ticks - ticks
+        while drop > 0 and self.runs:
+            length = self.runs[-1][1]
+            if length > drop:
+                self.runs[-1][1] -= drop
+                break
+            self.runs.pop()
+            drop -= length
+        self.ticks = min(self.ticks, ticks)
+        del self.checksums[self.ticks // self.interval:]
+
+    def to_bytes(self):
+        """Двоичное представление записи."""
+        out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, self.seed, self.tick_rate, self.interval,
+                                    self.ticks, len(self.runs), len(self.checksums), self.endless))
+        for bits, length in self.runs:
+            write_varint(out, length)
+            out.append(bits)
+        out += struct.pack(f"<{len(self.checksums)}I", *self.checksums)
+        return bytes(out)
+
+    def save(self, path):
+        """Сохранение записи в файл."""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+
+class Replay:
+    """Загруженная запись: сид, режим, серии ввода и контрольные суммы."""
+    def __init__(self, seed, tick_rate, interval, ticks, runs, checksums, endless=False):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.interval = interval
+        self.endless = endless
+        self.ticks = ticks
+        self.runs = runs
+        self.checksums = checksums
+
+    @classmethod
+    def load(cls, path):
+        """Чтение файла повтора."""
+        with open(path, "rb") as file:
+            data = file.read()
+        (magic, version, seed, tick_rate, interval, ticks, run_count, checksum_count,
+         endless) = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path}: неизвестный формат повтора")
+        offset = HEADER.size
+        runs = []
+        for _ in range(run_count):
+            length, offset = read_varint(data, offset)
+            runs.append((data[offset], length))
+            offset += 1
+        checksums = list(struct.unpack_from(f"<{checksum_count}I", data, offset))
+        return cls(seed, tick_rate, interval, ticks, runs, checksums, endless)
+
+    def inputs(self):
+        """Ввод по тикам."""
+        for bits, length in self.runs:
+            inputs = unpack_inputs(bits)
+            for _ in range(length):
+                yield inputs
+
+
+class ReplayPlayer:
+    """Повтор записи на симуляции с проверкой контрольных сумм.
+
+    Симуляция сбрасывается с сидом и в режиме записи; уровни сменяет сама
+    симуляция, как и при записи.
+    """
+    def __init__(self, replay, sim):
+        self.replay = replay
+        self.sim = sim
+        self.feed = replay.inputs()
+        self.tick = 0
+        self.divergence = None  # Первый тик с несовпавшей контрольной суммой
+        sim.reset(replay.seed, replay.endless)
+
+    @property
+    def finished(self):
+        return self.tick >= self.replay.ticks
+
+    def next_inputs(self):
+        """Ввод следующего тика записи."""
+        return next(self.feed)
+
+    def verify(self):
+        """Проверка контрольной суммы после шага; вызывается после каждого тика."""
+        self.tick += 1
+        if self.divergence is None and self.tick % self.replay.interval == 0:
+            index = self.tick // self.replay.interval - 1
+            if index < len(self.replay.checksums) and self.sim.checksum() != self.replay.checksums[index]:
+                self.divergence = self.tick
+
+    def step(self):
+        """Один тик записи без отрисовки. Возвращает события симуляции."""
+        events = self.sim.step(self.next_inputs())
+        self.verify()
+        return events
+
+
+def play_headless(path):
+    """Прогон записи с максимальной скоростью без экрана и звука."""
+    replay = Replay.load(path)
+    player = ReplayPlayer(replay, Simulation(tick_rate=replay.tick_rate, endless=replay.endless))
+    start = time.perf_counter()
+    while not player.finished:
+        player.step()
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": player.tick,
+        "divergence": player.divergence,
+        "score": player.sim.score,
+        "seconds": elapsed,
+        "ticks_per_second": player.tick / elapsed if elapsed else 0.0,
+    }
+
+
+def play_rendered(path):
+    """Просмотр записи в окне с обычной скоростью (1x)."""
+    import pygame
+    from game import Game
+    from timestep import FixedTimestep
+
+    replay = Replay.load(path)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Batty Replay")
+    game = Game(screen, sounds={}, record=False)
+    player = ReplayPlayer(replay, game.sim)
+    game.reset_game(replay.seed, replay.endless)
+    timestep = FixedTimestep(replay.tick_rate)
+    clock = pygame.time.Clock()
+    last_time = time.perf_counter()
+    while not player.finished:
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        now = time.perf_counter()
+        for _ in range(timestep.advance(now - last_time)):
+            if player.finished:
+                break
+            game.update(player.next_inputs())
+            player.verify()
+        last_time = now
+        game.draw(timestep.alpha)
+        clock.tick(FPS)
+    pygame.quit()
+    return {"ticks": player.tick, "divergence": player.divergence, "score": game.score}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение записи игры")
+    parser.add_argument("path", nargs="?", default=REPLAY_FILE, help="файл повтора")
+    parser.add_argument("--render", action="store_true", help="показать в окне со скоростью 1x")
+    args = parser.parse_args()
+
+    result = play_rendered(args.path) if args.render else play_headless(args.path)
+    if "ticks_per_second" in result:
+        print(f"Тиков: {result['ticks']} за {result['seconds']:.3f} с ({result['ticks_per_second']:.0f} тиков/с)")
+    else:
+        print(f"Тиков: {result['ticks']}")
+    print(f"Счет: {result['score']}")
+    if result["divergence"] is None:
+        print("Расхождений нет")
+    else:
+        print(f"Первое расхождение контрольной суммы на тике {result['divergence']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scheduler.py
+
+import time
+
+import pygame
+from settings import *
+
+# События окна, после которых содержимое нужно перерисовать
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESIZED, pygame.WINDOWSIZECHANGED)
+
+
+class LoopScheduler:
+    """Ожидание между кадрами главного цикла с учетом простоя.
+
+    Пока игра идет, кадры ограничиваются FPS через pygame.time.Clock. В меню,
+    на паузе и на экране конца игры ничего не меняется без ввода, поэтому
+    цикл засыпает в pygame.event.wait() до события или таймаута, а не
+    крутится на полной частоте. Для отчета отдельно учитываются реальное и
+    процессорное время активных кадров и простоя.
+    """
+    def __init__(self, fps=FPS, idle_timeout=IDLE_WAIT_MS):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.active_wall = 0.0
+        self.active_cpu = 0.0
+        self.idle_wall = 0.0
+        self.idle_cpu = 0.0
+        self.idle_waits = 0
+        self.woken = None  # Событие, разбудившее цикл; отдается первым в events()
+        self.last_wall = time.perf_counter()
+        self.last_cpu = time.process_time()
+
+    def account(self, idle):
+        """Отнесение времени с прошлого вызова к активной работе или простою."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if idle:
+            self.idle_wall += wall - self.last_wall
+            self.idle_cpu += cpu - self.last_cpu
+        else:
+            self.active_wall += wall - self.last_wall
+            self.active_cpu += cpu - self.last_cpu
+        self.last_wall = wall
+        self.last_cpu = cpu
+
+    def wait(self, idle):
+        """Ожидание следующего кадра; idle - на экране ничего не меняется без ввода.
+
+        Событие, разбудившее цикл, сохраняется и отдается первым в events():
+        возврат в очередь через pygame.event.post() поставил бы его после
+        пришедших позже событий.
+        """
+        self.account(False)
+        if not idle:
+            self.clock.tick(self.fps)
+            self.account(False)
+            return
+        event = pygame.event.wait(self.idle_timeout)
+        if event.type != pygame.NOEVENT:
+            self.woken = event
+        self.idle_waits += 1
+        self.clock.tick()  # Время простоя не должно попасть в следующий кадр
+        self.account(True)
+
+    def events(self):
+        """События для обработки в кадре: разбудившее цикл, затем очередь pygame."""
+        events = pygame.event.get()
+        if self.woken is not None:
+            events.insert(0, self.woken)
+            self.woken = None
+        return events
+
+    def stats(self):
+        """Время работы и оценка сэкономленного процессорного времени (секунды).
+
+        Экономия - сколько процессорного времени занял бы простой, если бы
+        цикл крутился с той же загрузкой, что и в активных кадрах.
+        """
+        busy_ratio = self.active_cpu / self.active_wall if self.active_wall else 0.0
+        return {
+            "active_wall": self.active_wall,
+            "active_cpu": self.active_cpu,
+            "idle_wall": self.idle_wall,
+            "idle_cpu": self.idle_cpu,
+            "idle_waits": self.idle_waits,
+            "cpu_saved": max(0.0, self.idle_wall * busy_ratio - self.idle_cpu),
+        }
+
+    def report(self):
+        """Вывод статистики простоя в консоль."""
+        stats = self.stats()
+        total = stats["active_wall"] + stats["idle_wall"]
+        share = stats["idle_wall"] / total * 100 if total else 0.0
+        print(f"Простой: {stats['idle_wall']:.1f} из {total:.1f} с ({share:.0f}%), "
+              f"процессор в простое: {stats['idle_cpu']:.2f} с, "
+              f"сэкономлено: {stats['cpu_saved']:.2f} с процессорного времени")
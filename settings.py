@@ -1,7 +1,21 @@
 # Настройки окна
 WIDTH = 800
 HEIGHT = 600
-FPS = 60  # Добавлено
+FPS = 60  # Ограничение частоты кадров отрисовки (0 - без ограничения)
+IDLE_WAIT_MS = 500  # Наибольшее время сна цикла в меню и на паузе в ожидании события
+RENDER_MODE = "retained"  # "retained" - слой плиток и грязные прямоугольники, "full" - полная перерисовка
+RENDER_BACKEND = "software"  # "software" - pygame.display, "gpu" - рендер SDL2 (pygame._sdl2.video)
+GPU_WINDOW_SIZE = (WIDTH, HEIGHT)  # Начальный размер GPU-окна; игра масштабируется под окно
+GPU_RENDER_DRIVER = None  # Драйвер рендера SDL ("opengl", "software", ...); None - выбор SDL
+GPU_VSYNC = False  # Вертикальная синхронизация в GPU-окне
+GPU_TEXT_TEXTURES = 256  # Сколько текстур текста держит GPU-отрисовщик
+
+# Шаг симуляции
+TICK_RATE = 60  # Шагов физики в секунду
+REFERENCE_TICK_RATE = 60  # Частота, для которой заданы скорости в пикселях за шаг
+MAX_CATCHUP_STEPS = 5  # Максимум шагов физики за один кадр
+SIM_THREAD = False  # Конвейер: физика в отдельном потоке, ввод и отрисовка в главном (pipeline.py)
+MAX_FRAME_TIME = 0.25  # Время кадра сверх этого (в секундах) не учитывается
 
 # Цвета
 BLACK = (0, 0, 0)
@@ -20,26 +34,15 @@ BAT_SPEED = 10
 # Параметры мяча
 BALL_RADIUS = 10
 BALL_SPEED = [5, -5]  # Начальная скорость мяча
+BALL_CAPACITY = 1024  # Наибольшее число мячей одновременно
+MULTI_BALL_COUNT = 2  # Сколько мячей добавляет бонус "мульти-мяч"
+SCALAR_BALL_LIMIT = 8  # До стольких мячей движение считается поштучно, дальше - пакетно
+MAX_IMPACTS_PER_STEP = 4  # Сколько ударов мяча разрешается за один шаг физики
 
-# Уровни сложности
-LEVELS = [
-    {
-        "tiles": [
-            {"color": RED, "hits": 1},
-            {"color": GREEN, "hits": 2},
-            {"color": BLUE, "hits": 3},
-        ],
-        "ball_speed": [5, -5]
-    },
-    {
-        "tiles": [
-            {"color": YELLOW, "hits": 1},
-            {"color": BLUE, "hits": 2},
-            {"color": RED, "hits": 3},
-        ],
-        "ball_speed": [6, -6]
-    },
-]
+# Уровни
+LEVELS_DIR = "levels"  # Каталог текстовых файлов уровней (*.lvl), идут по порядку имен
+LEVEL_CACHE_DIR = ".levelcache"  # Каталог скомпилированных уровней
+LEVEL_MMAP_MIN_BYTES = 64 * 1024  # Кэш-файлы от этого размера отображаются в память
 
 # Параметры плиток
 TILE_WIDTH = (WIDTH - 9 * 5) // 8  # Ширина плитки с учетом отступов
@@ -47,16 +50,97 @@ TILE_HEIGHT = 20  # Высота плитки
 TILE_PADDING = 5  # Расстояние между плитками
 TILE_OFFSET_Y = 50  # Смещение плиток вниз от верхнего края
 
+# Бесконечный режим (endless.py)
+ENDLESS_ROWS = 10  # Строк плиток в окне; нижняя строка окна уходит, не доходя до платформы
+ENDLESS_START_ROWS = 6  # Заполненных строк в начале игры
+ENDLESS_SCROLL_SECONDS = 8  # Интервал сдвига поля на строку вниз (игровое время)
+ENDLESS_CHUNK_ROWS = 16  # Строк в одном процедурном чанке
+ENDLESS_CHUNKS_AHEAD = 1  # Сколько следующих чанков генерируется впрок
+ENDLESS_CHUNKS_PER_LEVEL = 2  # Чанков подряд с типами плиток одного уровня
+ENDLESS_DENSITY = 0.7  # Доля заполненных ячеек в чанке
+ENDLESS_THREAD = True  # Генерация чанков впрок в отдельном потоке
+
 # Бонусы
 BONUS_TYPES = ["extend_bat", "slow_ball", "extra_life", "speed_up", "multi_ball", "invisibility"]
 BONUS_RADIUS = 15
 BONUS_ANIMATION_FRAMES = 10
+BONUS_DURATION_MS = 30000  # Время действия бонусов с таймером (игровое время)
+
+# Частицы
+PARTICLE_CAPACITY = 4096  # Емкость общего пула частиц
+PARTICLE_COLOR_LEVELS = 4  # Уровней яркости на канал: палитра частиц из 4**3 = 64 цветов (спрайтов)
 
 # Звуковые эффекты и музыка
 SOUND_HIT = "hit.wav"
 SOUND_LOSE = "lose.wav"
 SOUND_BONUS = "bonus.wav"
 MUSIC_BACKGROUND = "background_music.mp3"
+SOUND_FILES = {"hit": SOUND_HIT, "lose": SOUND_LOSE, "bonus": SOUND_BONUS}
+SOUND_CHANNELS = {"hit": 4, "lose": 1, "bonus": 2}  # Зарезервированные каналы по категориям
+SOUND_PRIORITY = {"lose": 3, "bonus": 2, "hit": 1}  # Чем больше, тем важнее звук
+SOUND_COALESCE_MS = {"hit": 40, "lose": 100, "bonus": 100}  # Окно слияния повторов
+SOUND_VOICES_PER_FRAME = 3  # Сколько звуков можно запустить за кадр
 
 # Шрифт
-FONT_SIZE = 36
\ No newline at end of file
+FONT_SIZE = 36
+HUD_HEIGHT = TILE_OFFSET_Y  # Полоса интерфейса (очки, жизни, уровень) над плитками
+
+# Кэш отрисованного текста
+TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Предельный объем памяти под поверхности текста
+
+# Регулятор качества по бюджету кадра
+GOVERNOR_ENABLED = True
+GOVERNOR_WINDOW = 30  # Кадров в скользящем окне замеров
+GOVERNOR_DOWNGRADE = 1.0  # Среднее время кадра выше этой доли бюджета 1/FPS - понижение качества
+GOVERNOR_UPGRADE = 0.6  # Ниже этой доли - повышение (разрыв порогов гасит колебания)
+GOVERNOR_COOLDOWN = 60  # Кадров после смены ступени без новых смен
+# Ступени качества от полной к самой экономной:
+# particle_spawn - доля частиц в эффектах, particle_draw_step - рисуется каждая n-я частица,
+# hud_on_change - интерфейс перерисовывается только при изменении значений,
+# render_scale - доля разрешения отрисовки (только для GPU-окна; без него регулятор
+# не опускается на ступени с render_scale < 1)
+QUALITY_TIERS = [
+    {"particle_spawn": 1.0, "particle_draw_step": 1, "hud_on_change": False, "render_scale": 1.0},
+    {"particle_spawn": 0.5, "particle_draw_step": 1, "hud_on_change": True, "render_scale": 1.0},
+    {"particle_spawn": 0.25, "particle_draw_step": 2, "hud_on_change": True, "render_scale": 1.0},
+    {"particle_spawn": 0.25, "particle_draw_step": 2, "hud_on_change": True, "render_scale": 0.5},
+]
+
+# Сборщик мусора
+GC_POLICY_ENABLED = True  # Полные сборки только в меню и на переходах, gc.freeze() после них
+GC_GAMEPLAY_GEN2_THRESHOLD = 1_000_000  # Порог полной сборки во время игры (фактически никогда)
+GC_HISTORY = 600  # Сколько последних кадров хранят счетчики аллокаций и пауз
+
+# Запись и повтор игры
+REPLAY_FILE = "last.replay"  # Куда пишется запись последней игры (None - не записывать)
+REPLAY_CHECKSUM_INTERVAL = 60  # Раз в сколько тиков в запись идет контрольная сумма состояния
+
+# Снимки состояния и перемотка
+SNAPSHOT_INTERVAL = 10  # Раз в сколько тиков делается снимок для перемотки
+SNAPSHOT_KEYFRAME_EVERY = 10  # Каждый такой снимок хранится целиком, остальные - разностью
+REWIND_SECONDS = 5  # На сколько секунд игрового времени перематывает Backspace
+
+# Пакетный прогон игр (batch.py)
+BATCH_MAX_TICKS = 10 * 60 * TICK_RATE  # Предел длины одной игры: 10 минут игрового времени
+BATCH_DEADZONE = 20  # Допуск автопилота: платформа не двигается, пока мяч ближе к центру
+
+# Замеры производительности (bench.py)
+BENCH_FRAMES = 600  # Кадров в замере каждого сценария
+BENCH_WARMUP_FRAMES = 60  # Кадров прогрева перед замером: кэши текста, спрайты, слой плиток
+BENCH_SEED = 1  # Сид всех сценариев: одинаковые замеры от запуска к запуску
+BENCH_BALLS = 64  # Мячей в сценарии multiball
+BENCH_RALLY_SPEED = 2.0  # Множитель скорости мяча в сценарии rally
+BENCH_STORM_PERIOD = 30  # Раз в сколько кадров поле создается и разбивается целиком в сценарии storm
+BENCH_THRESHOLD = 15.0  # Допустимое падение относительного FPS (см. BENCH_CALIBRATION_*), в процентах
+BENCH_CALIBRATION_FRAMES = 100  # Кадров в одном прогоне калибровочной нагрузки перед сценарием
+BENCH_CALIBRATION_RUNS = 5  # Прогонов калибровки; берется самый быстрый
+BENCH_CALIBRATION_SPRITES = 400  # Спрайтов в кадре калибровочной нагрузки
+BENCH_BASELINE = "bench_baseline.json"  # Опорные замеры этой машины (в репозиторий не входят)
+BENCH_OUTPUT = "bench.json"  # Результаты последнего прогона
+
+# Профилировщик кадра
+PROFILER_ENABLED = False  # При False все замеры заменяются пустыми вызовами
+PROFILER_HISTORY = 600  # Сколько последних кадров хранится в кольцевом буфере
+PROFILER_OVERLAY_REFRESH = 15  # Раз в сколько кадров обновляются цифры оверлея
+PROFILER_EXPORT = "profile.json"  # Куда выгрузить замеры при выходе (.json или .csv, None - не выгружать)
+TELEMETRY_REPORT = False  # Печатать ли в консоль время запуска и телеметрию регулятора, сборщика и простоя
@@ -0,0 +1,398 @@
+# simulation.py
+
+import random
+import zlib
+from collections import namedtuple
+
+import numpy as np
+from settings import *
+from objects import Bat, Bonus
+from balls import BallSystem
+from effects import EffectScheduler, TIMED_EFFECTS
+from tilegrid import TileGrid
+from levels import load_levels
+from endless import TileStream
+from profiler import profiler
+from collision import CONTACT_EPSILON, reflect, sweep_circle_rect, sweep_circle_walls
+
+# Состояние ввода на один тик: стрелки влево/вправо, пауза и открытый диалог выхода
+InputState = namedtuple("InputState", ["left", "right", "pause", "escape"])
+NO_INPUT = InputState(False, False, False, False)
+
+# Событие симуляции: вид, координаты и дополнительные данные (плитка, тип бонуса)
+SimEvent = namedtuple("SimEvent", ["kind", "x", "y", "data"])
+
+
+class Simulation:
+    """Игровая логика без экрана и звука.
+
+    Получает ввод явной структурой InputState, а время ведет само: каждый
+    вызов step() - один тик длиной tick_ms, поэтому симуляция не обращается
+    ни к SDL, ни к pygame.time, а на паузе ее часы стоят. Все, что должно
+    отразиться на экране или в динамиках, складывается в список событий,
+    который возвращает step().
+
+    В бесконечном режиме (endless=True) уровней нет: плитки приходят из
+    TileStream, который периодически сдвигает поле вниз на строку.
+    """
+    def __init__(self, seed=None, tick_rate=TICK_RATE, levels=None, endless=False):
+        self.rng = random.Random()  # Все случайные решения игры; сид задается в reset()
+        self.levels = levels if levels is not None else load_levels()
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate  # Длительность шага в миллисекундах
+        # Скорости заданы в пикселях за опорный шаг, поэтому при другой частоте
+        # шагов перемещение за шаг масштабируется
+        self.step_scale = REFERENCE_TICK_RATE / tick_rate
+        self.bat = Bat()
+        self.balls = BallSystem()
+        self.bonus = Bonus(self.rng)
+        self.level = 0
+        self.endless = endless
+        self.stream = None  # Поток строк плиток бесконечного режима
+        self.events = []
+        self.effects = EffectScheduler()  # Бонусы с ограниченным временем действия
+        self.reset(seed)
+
+    def reset(self, seed=None, endless=None):
+        """Сброс игры. Без сида выбирается новый случайный; с тем же сидом и вводом игра повторяется.
+
+        endless переключает бесконечный режим; None оставляет текущий.
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        if endless is not None:
+            self.endless = endless
+        self.rng.seed(self.seed)
+        self.score = 0
+        self.lives = 3
+        self.level = 0
+        if self.endless:
+            self.stream = TileStream(self.levels, self.seed, self.tick_rate)
+            self.tiles = self.stream.create_tiles()
+            self.level = self.stream.level
+        else:
+            self.stream = None
+            self.tiles = self.create_tiles()
+        self.bonus.active = False
+        self.bonus.place(self.rng)
+        self.bat.width = BAT_WIDTH
+        self.bat.is_extended = False
+        self.bat.pos = [WIDTH // 2 - self.bat.width // 2, HEIGHT - 50]
+        self.bat.prev_pos = self.bat.pos.copy()
+        self.bat_visible = True
+
+        # Игровые часы и эффекты бонусов
+        self.tick = 0  # Номер шага симуляции
+        self.time = 0  # Игровое время в миллисекундах
+        self.effects.clear()
+        self.speed_factor = 1.0  # Общий множитель скорости мячей от активных эффектов
+        self.extend_count = 0  # Сколько эффектов расширения платформы активно
+        self.invisibility_count = 0  # Сколько эффектов невидимости активно
+        self.reset_balls()
+
+    def create_tiles(self):
+        """Создание сетки плиток текущего уровня."""
+        level = self.levels[self.level]
+        hits, color = level.layout(self.rng)
+        return TileGrid.from_arrays(hits, color, level.palette, *level.tile_size)
+
+    def next_level(self):
+        """Переход на следующий уровень (после последнего - снова первый).
+
+        Вызывается из step() на том же тике, на котором разбита последняя плитка.
+
+        Счет, жизни, платформа и действующие бонусы сохраняются; на поле
+        остается один мяч со скоростью нового уровня.
+        """
+        self.level = (self.level + 1) % len(self.levels)
+        self.tiles = self.create_tiles()
+        self.bonus.active = False
+        self.reset_balls()
+
+    @property
+    def over(self):
+        """Игра окончена: жизней не осталось."""
+        return self.lives <= 0
+
+    def checksum(self):
+        """CRC32 состояния симуляции для проверки повторов."""
+        n = self.balls.count
+        # Координаты приводятся к float: после восстановления снимка они всегда дробные
+        state = (self.tick, self.score, self.lives, self.level, float(self.bat.pos[0]), float(self.bat.pos[1]),
+                 float(self.bat.width), self.bonus.active, self.bonus.pos, self.speed_factor, len(self.effects))
+        crc = zlib.crc32(repr(state).encode())
+        crc = zlib.crc32(self.balls.pos[:n].tobytes(), crc)
+        crc = zlib.crc32(self.balls.speed[:n].tobytes(), crc)
+        return zlib.crc32(self.tiles.hits.tobytes(), crc)
+
+    def emit(self, kind, x=0, y=0, data=None):
+        """Добавление события для фронтенда."""
+        self.events.append(SimEvent(kind, x, y, data))
+
+    def step(self, inputs):
+        """Один шаг симуляции. Возвращает список событий за этот шаг."""
+        self.events = []
+        if inputs.pause or inputs.escape:  # Если игра на паузе или открыт диалог
+            return self.events
+
+        self.tick += 1
+        self.time += self.tick_ms
+        with profiler.phase("timers"):
+            self.effects.advance(self, self.time)
+
+        self.bat.prev_pos[0] = self.bat.pos[0]
+        if inputs.left:
+            self.bat.move_left(self.step_scale)
+        if inputs.right:
+            self.bat.move_right(self.step_scale)
+
+        with profiler.phase("collisions"):
+            self.check_collisions()
+
+        # Уровень сменяется здесь же, поэтому игра, повторы и пакетные прогоны
+        # не расходятся; событие level_cleared нужно только фронтенду
+        if any(event.kind == "level_cleared" for event in self.events):
+            self.next_level()
+
+        if self.stream is not None and self.stream.advance(self.tiles):
+            self.level = self.stream.level
+            self.emit("tiles_scrolled")
+            self.push_out_of_tiles()
+        return self.events
+
+    def set_speed_factor(self, factor):
+        """Изменение общего множителя скорости с пересчетом скоростей всех мячей."""
+        self.balls.speed[:self.balls.count] *= factor / self.speed_factor
+        self.speed_factor = factor
+
+    def reset_balls(self):
+        """Один мяч в центре со скоростью уровня (с учетом активных эффектов)."""
+        vx, vy = self.levels[self.level].ball_speed
+        self.balls.reset(WIDTH // 2, HEIGHT // 2, vx * self.speed_factor, vy * self.speed_factor)
+
+    def check_collisions(self):
+        """Движение мячей и проверка столкновений."""
+        self.move_balls()
+        balls = self.balls
+
+        # Проверка столкновения мячей с бонусом
+        if self.bonus.active:
+            offset = balls.pos[:balls.count] - self.bonus.pos
+            reach = balls.radius + self.bonus.radius
+            if ((offset * offset).sum(axis=1) <= reach * reach).any():
+                self.activate_bonus(self.rng.choice(BONUS_TYPES))
+                self.bonus.active = False
+
+        # Проверка проигрыша (мяч ушел за платформу)
+        lost = np.flatnonzero(balls.pos[:balls.count, 1] >= HEIGHT - balls.radius)
+        if lost.size:
+            for x, y in balls.pos[lost].tolist():
+                self.lives -= 1
+                self.emit("ball_lost", x, y)
+                if self.lives == 0:
+                    self.emit("game_over")
+                    break  # Остальные мячи того же тика жизней уже не отнимают
+
+            # Удаляем все мячи, кроме одного, и возвращаем его в центр
+            self.reset_balls()
+
+    def move_balls(self):
+        """Перемещение всех мячей за шаг.
+
+        Большинство мячей на шаге ни во что не врезается, поэтому они
+        обрабатываются пакетно: широкая фаза по плиткам, удар по верхней грани
+        платформы и отражение от стен считаются векторно сразу для всех мячей.
+        Точный покадровый решатель move_ball() вызывается только для мячей,
+        рядом с которыми есть живые плитки, или задевающих платформу сбоку.
+        """
+        balls = self.balls
+        n = balls.count
+        if n <= SCALAR_BALL_LIMIT:
+            # На нескольких мячах накладные расходы NumPy дороже точного решателя
+            for i in range(n):
+                balls.prev_pos[i] = balls.pos[i]
+                self.move_ball(i)
+            return
+        radius = balls.radius
+        balls.prev_pos[:n] = balls.pos[:n]
+        start = balls.pos[:n].copy()
+        delta = balls.speed[:n] * self.step_scale
+        end = start + delta
+
+        # Широкая фаза: описанный прямоугольник пути с запасом на отражение от стен
+        reach = np.abs(delta) + radius
+        low = np.minimum(start, end) - reach
+        high = np.maximum(start, end) + reach
+        near_tiles = self.tiles.occupied(low[:, 0], low[:, 1], high[:, 0], high[:, 1])
+
+        bat = self.bat
+        bat_left, bat_top = bat.pos[0], bat.pos[1]
+        bat_right, bat_bottom = bat_left + bat.width, bat_top + bat.height
+        near_bat = (high[:, 0] > bat_left) & (low[:, 0] < bat_right) & (high[:, 1] > bat_top) & (low[:, 1] < bat_bottom)
+
+        # Чистый удар сверху: центр пересекает линию касания над платформой
+        contact_y = bat_top - radius
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (contact_y - start[:, 1]) / delta[:, 1]
+        contact_x = start[:, 0] + delta[:, 0] * t
+        top_hit = (near_bat & (delta[:, 1] > 0) & (start[:, 1] <= contact_y) & (end[:, 1] >= contact_y)
+                   & (contact_x >= bat_left) & (contact_x <= bat_right))
+        exact = near_tiles | (near_bat & ~top_hit)
+        simple = np.flatnonzero(~exact)
+
+        pos = end[simple]
+        speed = balls.speed[simple]
+
+        # Отскок от платформы: угол зависит от точки удара, скорость - от множителя эффектов
+        bounced = np.flatnonzero(top_hit[simple])
+        if bounced.size:
+            hit_x = contact_x[simple[bounced]]
+            half = bat.width / 2
+            speed[bounced, 0] = -((bat_left + half) - hit_x) / half * 5 * self.speed_factor
+            speed[bounced, 1] = -np.abs(speed[bounced, 1])
+            rest = (1 - t[simple[bounced]]) * self.step_scale
+            pos[bounced, 0] = hit_x + speed[bounced, 0] * rest
+            pos[bounced, 1] = contact_y + speed[bounced, 1] * rest
+            for x in hit_x.tolist():
+                self.hit_bat(x, contact_y)
+
+        # Отражение от стен: позиция за стеной зеркалится обратно
+        wall = pos[:, 0] < radius
+        pos[wall, 0] = 2 * radius - pos[wall, 0]
+        speed[wall, 0] = np.abs(speed[wall, 0])
+        wall = pos[:, 0] > WIDTH - radius
+        pos[wall, 0] = 2 * (WIDTH - radius) - pos[wall, 0]
+        speed[wall, 0] = -np.abs(speed[wall, 0])
+        wall = pos[:, 1] < radius
+        pos[wall, 1] = 2 * radius - pos[wall, 1]
+        speed[wall, 1] = np.abs(speed[wall, 1])
+
+        balls.pos[simple] = pos
+        balls.speed[simple] = speed
+
+        for i in np.flatnonzero(exact).tolist():
+            self.move_ball(i)
+
+    def move_ball(self, i):
+        """Перемещение мяча i за шаг с непрерывной проверкой столкновений.
+
+        На каждой итерации ищется самый ранний удар на оставшемся отрезке пути
+        (стены, платформа, плитки из широкой фазы), мяч переносится в точку
+        касания, скорость отражается, и движение продолжается на остаток шага.
+        Так мяч не проскакивает сквозь плитки на высокой скорости и не
+        отражается дважды от двух плиток, задетых одновременно.
+        """
+        balls = self.balls
+        radius = balls.radius
+        bat = self.bat
+        x, y = balls.pos[i].tolist()
+        vx, vy = balls.speed[i].tolist()
+        remaining = self.step_scale
+        for _ in range(MAX_IMPACTS_PER_STEP):
+            dx = vx * remaining
+            dy = vy * remaining
+
+            # Самый ранний удар среди стен, платформы и плиток
+            best = sweep_circle_walls(x, y, dx, dy, radius, WIDTH)
+            target = None
+            hit = sweep_circle_rect(x, y, dx, dy, radius, bat.pos[0], bat.pos[1],
+                                    bat.pos[0] + bat.width, bat.pos[1] + bat.height)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best, target = hit, bat
+            tiles = self.tiles
+            for cell in tiles.query(min(x, x + dx) - radius, min(y, y + dy) - radius,
+                                    max(x, x + dx) + radius, max(y, y + dy) + radius):
+                hit = sweep_circle_rect(x, y, dx, dy, radius, *tiles.bounds(cell))
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best, target = hit, cell
+
+            if best is None:
+                x += dx
+                y += dy
+                break
+
+            t, nx, ny = best
+            x += dx * t + nx * CONTACT_EPSILON
+            y += dy * t + ny * CONTACT_EPSILON
+            if target is bat:
+                if ny < 0:
+                    # Удар сверху: угол отскока зависит от точки удара
+                    half = bat.width / 2
+                    vx = -((bat.pos[0] + half) - x) / half * 5 * self.speed_factor
+                    vy = -abs(vy)
+                else:
+                    vx, vy = reflect(vx, vy, nx, ny)
+                self.hit_bat(x, y)
+            else:
+                vx, vy = reflect(vx, vy, nx, ny)
+                if target is not None:
+                    self.hit_tile(target)
+            remaining *= 1 - t
+
+        balls.pos[i] = (x, y)
+        balls.speed[i] = (vx, vy)
+
+    def push_out_of_tiles(self):
+        """Мячи, на которые опустились плитки при сдвиге поля: удар по плитке и выталкивание вниз.
+
+        Непрерывная проверка столкновений не видит пересечения в начале шага,
+        поэтому без этого мяч прошел бы сквозь плитку.
+        """
+        balls = self.balls
+        radius = balls.radius
+        tiles = self.tiles
+        for i in range(balls.count):
+            x, y = balls.pos[i].tolist()
+            moved = False
+            for _ in range(tiles.rows):  # Под плиткой может оказаться следующая строка
+                overlap = None
+                for cell in tiles.query(x - radius, y - radius, x + radius, y + radius):
+                    left, top, right, bottom = tiles.bounds(cell)
+                    dx = x - min(max(x, left), right)
+                    dy = y - min(max(y, top), bottom)
+                    if dx * dx + dy * dy < radius * radius:
+                        overlap = cell
+                        break
+                if overlap is None:
+                    break
+                self.hit_tile(overlap)
+                y = tiles.bounds(overlap)[3] + radius + CONTACT_EPSILON
+                moved = True
+            if moved:
+                balls.pos[i, 1] = balls.prev_pos[i, 1] = y
+                balls.speed[i, 1] = abs(balls.speed[i, 1])
+
+    def hit_bat(self, x, y):
+        """Очки, событие и шанс бонуса за отскок мяча от платформы."""
+        self.score += 1
+        self.emit("bat_hit", x, y)
+
+        # Создаем бонус с вероятностью 10%
+        if self.rng.randint(1, 10) == 1:
+            self.bonus.active = True
+            self.bonus.place(self.rng)
+
+    def hit_tile(self, cell):
+        """Удар мяча по плитке в ячейке cell."""
+        x, y = self.tiles.center(cell)
+        if self.tiles.hit(cell) == 0:
+            self.emit("tile_destroyed", x, y, cell)
+            if not self.tiles and self.stream is None:
+                self.emit("level_cleared")
+        else:
+            self.emit("tile_hit", x, y, cell)
+        self.score += 10
+
+    def activate_bonus(self, bonus_type):
+        """Активация бонуса."""
+        if bonus_type in TIMED_EFFECTS:
+            # Расширение платформы, замедление, ускорение, невидимость - на время
+            self.effects.add(self, TIMED_EFFECTS[bonus_type](), self.time)
+        elif bonus_type == "extra_life":
+            self.lives += 1  # Бонус на жизнь не требует таймера
+        elif bonus_type == "multi_ball":
+            x, y = self.balls.pos[0].tolist()
+            for _ in range(MULTI_BALL_COUNT):
+                self.balls.add(x, y, self.rng.choice([-5, 5]) * self.speed_factor,
+                               self.rng.choice([-5, 5]) * self.speed_factor)
+
+        self.emit("bonus", self.bonus.pos[0], self.bonus.pos[1], bonus_type)
@@ -0,0 +1,189 @@
+# snapshot.py
+
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+from settings import *
+from effects import TIMED_EFFECTS
+from tilegrid import TileGrid
+from endless import TileStream
+
+# Снимок: заголовок со скалярами, состояние RNG, палитра, активные эффекты,
+# затем сырые массивы мячей и плиток. Все числа - little-endian. Положение
+# потока бесконечного режима - номер следующей строки (-1 без потока) и
+# отсчет до сдвига.
+MAGIC = b"BSNP"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHQqdqiidii?ddddd??iiIIIHHHHdqi")
+EFFECT = struct.Struct("<dQB")  # Время окончания, порядковый номер, индекс типа
+RNG_WORDS = 625  # Размер состояния Mersenne Twister в 32-битных словах
+EFFECT_NAMES = list(TIMED_EFFECTS)
+
+
+def take_snapshot(sim):
+    """Полное состояние симуляции в байтах."""
+    bat = sim.bat
+    balls = sim.balls
+    tiles = sim.tiles
+    n = balls.count
+    version, words, gauss = sim.rng.getstate()
+    active = sim.effects.heap
+    stream = sim.stream
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, sim.seed, sim.tick, sim.time, sim.score, sim.lives, sim.level,
+                    sim.speed_factor, sim.extend_count, sim.invisibility_count, sim.bat_visible,
+                    bat.pos[0], bat.pos[1], bat.prev_pos[0], bat.prev_pos[1], bat.width, bat.is_extended,
+                    sim.bonus.active, sim.bonus.pos[0], sim.bonus.pos[1], n, tiles.rows, tiles.cols,
+                    tiles.tile_width, tiles.tile_height, len(tiles.palette), len(active),
+                    float("nan") if gauss is None else gauss,
+                    -1 if stream is None else stream.generated, 0 if stream is None else stream.countdown),
+        np.array(words, dtype=np.uint32).tobytes(),
+        bytes(channel for color in tiles.palette for channel in color),
+    ]
+    parts += [EFFECT.pack(end, order, EFFECT_NAMES.index(effect.name)) for end, order, effect in active]
+    parts += [balls.pos[:n].tobytes(), balls.prev_pos[:n].tobytes(), balls.speed[:n].tobytes(),
+              tiles.hits.tobytes(), tiles.color.tobytes()]
+    return b"".join(parts)
+
+
+def restore_snapshot(sim, data, reuse_tiles=False):
+    """Восстановление состояния симуляции из снимка take_snapshot().
+
+    По умолчанию сетка плиток создается заново. С reuse_tiles=True сетка той
+    же формы и палитры обновляется на месте, и функция возвращает номера
+    изменившихся ячеек (None - сетка все же создана заново): так отрисовщик
+    может обновить только их, не перестраивая слой плиток.
+    """
+    (magic, version, sim.seed, sim.tick, sim.time, sim.score, sim.lives, sim.level,
+     sim.speed_factor, sim.extend_count, sim.invisibility_count, sim.bat_visible,
+     bat_x, bat_y, prev_x, prev_y, bat_width, is_extended, bonus_active, bonus_x, bonus_y,
+     n, rows, cols, tile_width, tile_height, colors, effects, gauss,
+     generated, countdown) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("неизвестный формат снимка")
+    # Режим игры берется из снимка; поток строк зависит только от сида
+    sim.endless = generated >= 0
+    if not sim.endless:
+        sim.stream = None
+    else:
+        if sim.stream is None or sim.stream.source.seed != sim.seed:
+            sim.stream = TileStream(sim.levels, sim.seed, sim.tick_rate)
+        sim.stream.seek(generated, countdown)
+    offset = HEADER.size
+
+    words = np.frombuffer(data, dtype=np.uint32, count=RNG_WORDS, offset=offset)
+    sim.rng.setstate((3, tuple(words.tolist()), None if gauss != gauss else gauss))
+    offset += RNG_WORDS * 4
+    channels = data[offset:offset + colors * 3]
+    palette = [tuple(channels[i:i + 3]) for i in range(0, colors * 3, 3)]
+    offset += colors * 3
+
+    heap = []
+    for _ in range(effects):
+        end, order, kind = EFFECT.unpack_from(data, offset)
+        heap.append((end, order, TIMED_EFFECTS[EFFECT_NAMES[kind]]()))
+        offset += EFFECT.size
+    sim.effects.restore(heap)
+
+    bat = sim.bat
+    bat.pos = [bat_x, bat_y]
+    bat.prev_pos = [prev_x, prev_y]
+    bat.width = bat_width
+    bat.is_extended = is_extended
+    sim.bonus.active = bonus_active
+    sim.bonus.pos = [bonus_x, bonus_y]
+
+    balls = sim.balls
+    size = n * 2
+    for array in (balls.pos, balls.prev_pos, balls.speed):
+        array[:n] = np.frombuffer(data, dtype=np.float64, count=size, offset=offset).reshape(n, 2)
+        offset += size * 8
+    balls.count = n
+
+    cells = rows * cols
+    hits = np.frombuffer(data, dtype=np.int16, count=cells, offset=offset).reshape(rows, cols)
+    offset += cells * 2
+    color = np.frombuffer(data, dtype=np.uint8, count=cells, offset=offset).reshape(rows, cols)
+    tiles = sim.tiles
+    same_shape = (tiles.rows, tiles.cols, tiles.tile_width, tiles.tile_height) == (rows, cols, tile_width, tile_height)
+    if reuse_tiles and same_shape and tiles.palette == palette:
+        return tiles.sync(hits, color)
+    sim.tiles = TileGrid.from_arrays(hits, color, palette, tile_width, tile_height)
+    return None
+
+
+class RewindBuffer:
+    """Кольцевой буфер снимков для перемотки назад.
+
+    Снимок делается каждые interval тиков. Каждый keyframe_every-й снимок -
+    опорный, остальные хранятся как XOR с последним опорным: между соседними
+    снимками меняется немного байт, поэтому после сжатия zlib разностный
+    снимок занимает сотни байт. Опорный снимок держится в памяти в
+    несжатом виде, пока на него ссылается хоть одна разность в буфере.
+    """
+    def __init__(self, interval=SNAPSHOT_INTERVAL, seconds=REWIND_SECONDS,
+                 keyframe_every=SNAPSHOT_KEYFRAME_EVERY, tick_rate=TICK_RATE):
+        self.interval = interval
+        self.keyframe_every = keyframe_every
+        self.tick_rate = tick_rate
+        self.entries = deque(maxlen=max(1, int(seconds * tick_rate) // interval + 1))  # (тик, опорный, данные)
+        self.key = None  # Последний опорный снимок (несжатый)
+        self.since_key = 0
+
+    def record(self, sim):
+        """Снимок, если подошел его тик; вызывается после каждого шага."""
+        if sim.tick % self.interval or (self.entries and self.entries[-1][0] == sim.tick):
+            return
+        data = take_snapshot(sim)
+        if self.key is None or self.since_key >= self.keyframe_every or len(data) != len(self.key):
+            self.key = data
+            self.since_key = 0
+            self.entries.append((sim.tick, None, zlib.compress(data, 1)))
+        else:
+            delta = np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), np.frombuffer(self.key, dtype=np.uint8))
+            self.entries.append((sim.tick, self.key, zlib.compress(delta.tobytes(), 1)))
+        self.since_key += 1
+
+    def snapshot(self, index):
+        """Полный снимок записи с индексом index."""
+        _, base, payload = self.entries[index]
+        data = zlib.decompress(payload)
+        if base is None:
+            return data
+        return np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), np.frombuffer(base, dtype=np.uint8)).tobytes()
+
+    def rewind(self, sim, seconds=REWIND_SECONDS):
+        """Перемотка на seconds назад (или на самый старый снимок).
+
+        Более поздние снимки отбрасываются. Возвращает тик, на который
+        перемотали, или None, если буфер пуст.
+        """
+        if not self.entries:
+            return None
+        target = sim.tick - seconds * self.tick_rate
+        index = 0
+        for i, (tick, _, _) in enumerate(self.entries):
+            if tick <= target:
+                index = i
+        restore_snapshot(sim, self.snapshot(index))
+        while len(self.entries) > index + 1:
+            self.entries.pop()
+        # Следующий снимок снова начнет новую цепочку разностей
+        self.key = None
+        return sim.tick
+
+    def clear(self):
+        self.entries.clear()
+        self.key = None
+        self.since_key = 0
+
+    @property
+    def nbytes(self):
+        """Память под снимки: сжатые данные и удерживаемые опорные снимки."""
+        keys = {id(base): len(base) for _, base, _ in self.entries if base is not None}
+        return sum(len(payload) for _, _, payload in self.entries) + sum(keys.values())
+
+    def __len__(self):
+        return len(self.entries)
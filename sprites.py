@@ -0,0 +1,61 @@
+# sprites.py
+
+import numpy as np
+import pygame
+from settings import *
+
+
+class SpriteCache:
+    """Кэш заранее отрисованных кругов.
+
+    Каждый круг (радиус, цвет) рисуется pygame.draw.circle один раз в
+    поверхность 2r x 2r с фоном по цветовому ключу, а дальше только
+    копируется. Так все круги кадра можно вывести одним вызовом Surface.blits() вместо
+    сотен вызовов pygame.draw.circle из Python. Цвета частиц берутся из
+    палитры PARTICLE_COLORS, и их спрайты собираются в массив, который
+    индексируется номерами цветов сразу для всех частиц.
+    """
+    def __init__(self):
+        self.circles = {}  # (радиус, цвет) -> поверхность
+        self.palettes = {}  # Радиус -> массив спрайтов частиц по номеру цвета
+
+    def circle(self, radius, color):
+        """Поверхность с кругом радиуса radius; рисуется только при первом запросе."""
+        key = (radius, tuple(color))
+        surface = self.circles.get(key)
+        if surface is None:
+            # Фон - цветовой ключ (копируется быстрее попиксельной альфы); он не должен совпасть с кругом
+            background = BLACK if tuple(color) != BLACK else WHITE
+            surface = pygame.Surface((radius * 2, radius * 2))
+            surface.fill(background)
+            pygame.draw.circle(surface, color, (radius, radius), radius)
+            surface.set_colorkey(background)
+            self.circles[key] = surface
+        return surface
+
+    def particle_sprites(self, radius):
+        """Массив спрайтов всех цветов частиц (dtype=object) для радиуса radius."""
+        sprites = self.palettes.get(radius)
+        if sprites is None:
+            sprites = np.empty(len(PARTICLE_COLORS), dtype=object)
+            for index, color in enumerate(PARTICLE_COLORS.tolist()):
+                sprites[index] = self.circle(radius, color)
+            self.palettes[radius] = sprites
+        return sprites
+
+    def clear(self):
+        self.circles.clear()
+        self.palettes.clear()
+
+
+def blit_circles(sprite, points, radius):
+    """Последовательность (поверхность, позиция) для одного спрайта в точках (n, 2)."""
+    corners = (points - radius).tolist()
+    return zip([sprite] * len(corners), corners)
+
+
+# Палитра частиц: все сочетания PARTICLE_COLOR_LEVELS уровней по каждому каналу
+_levels = np.linspace(0, 255, PARTICLE_COLOR_LEVELS).astype(np.uint8)
+PARTICLE_COLORS = np.stack(np.meshgrid(_levels, _levels, _levels, indexing="ij"), axis=-1).reshape(-1, 3)
+
+sprite_cache = SpriteCache()
@@ -0,0 +1,225 @@
+# tilegrid.py
+
+import numpy as np
+import pygame
+from settings import *
+from utils import draw_text
+
+
+class TileGrid:
+    """Сетка плиток в плоских массивах (структура массивов).
+
+    Плитка - это номер ячейки cell = row * cols + col, а не объект: прочность,
+    индекс цвета в палитре и признак жизни лежат в типизированных массивах
+    NumPy, прямоугольник вычисляется по номеру ячейки только по запросу.
+    Живые ячейки собраны в плотный список с обратными индексами, поэтому
+    разрушение стоит O(1), а обход идет только по живым плиткам. Сетка
+    заодно служит пространственным индексом: ячейка плитки вычисляется
+    по координатам напрямую.
+    """
+    __slots__ = ("rows", "cols", "tile_width", "tile_height", "cell_width", "cell_height",
+                 "hits", "color", "alive", "live", "slot", "count", "palette", "prefix")
+
+    def __init__(self, rows, cols, tile_width=TILE_WIDTH, tile_height=TILE_HEIGHT):
+        self.rows = rows
+        self.cols = cols
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.cell_width = tile_width + TILE_PADDING
+        self.cell_height = tile_height + TILE_PADDING
+        size = rows * cols
+        self.hits = np.zeros(size, dtype=np.int16)  # Оставшиеся удары до разрушения
+        self.color = np.zeros(size, dtype=np.uint8)  # Индекс цвета в палитре
+        self.alive = np.zeros((rows, cols), dtype=np.uint8)  # 1 - в ячейке живая плитка
+        self.live = np.zeros(size, dtype=np.int32)  # Номера живых ячеек в [0, count)
+        self.slot = np.full(size, -1, dtype=np.int32)  # Ячейка -> позиция в live или -1
+        self.count = 0
+        self.palette = list(COLORS)  # Цвета плиток; в массиве хранится только индекс
+        self.prefix = None  # Таблица префиксных сумм alive, пересчитывается лениво
+
+    @classmethod
+    def from_arrays(cls, hits, color, palette, tile_width=TILE_WIDTH, tile_height=TILE_HEIGHT):
+        """Сетка из готовых массивов прочности и индексов цвета (rows x cols) за O(n) в NumPy."""
+        rows, cols = hits.shape
+        grid = cls(rows, cols, tile_width, tile_height)
+        grid.palette = list(palette)
+        grid.hits[:] = hits.ravel()
+        grid.color[:] = color.ravel()
+        grid.reindex()
+        return grid
+
+    def reindex(self):
+        """Пересчет списка живых ячеек и признаков жизни по массиву прочности за O(n) в NumPy."""
+        live = np.flatnonzero(self.hits > 0).astype(np.int32)
+        self.count = live.size
+        self.live[:live.size] = live
+        self.slot[:] = -1
+        self.slot[live] = np.arange(live.size, dtype=np.int32)
+        self.alive[:] = 0
+        self.alive.flat[live] = 1
+        self.prefix = None
+
+    def shift_down(self, hits, color):
+        """Сдвиг всех плиток на строку вниз: нижняя строка выбрасывается, сверху - новая.
+
+        Номера ячеек всех плиток при этом меняются, отрисовщик должен
+        перестроить слой плиток.
+        """
+        grid_hits = self.hits.reshape(self.rows, self.cols)
+        grid_color = self.color.reshape(self.rows, self.cols)
+        grid_hits[1:] = grid_hits[:-1]
+        grid_color[1:] = grid_color[:-1]
+        grid_hits[0] = hits
+        grid_color[0] = color
+        self.reindex()
+
+    def add(self, row, col, hits, color):
+        """Размещение плитки в ячейке (row, col). Возвращает номер ячейки."""
+        cell = row * self.cols + col
+        if color not in self.palette:
+            self.palette.append(color)
+        self.hits[cell] = hits
+        self.color[cell] = self.palette.index(color)
+        self.link(cell)
+        return cell
+
+    def link(self, cell):
+        """Включение ячейки в список живых, если ее там еще нет."""
+        if self.slot[cell] < 0:
+            self.slot[cell] = self.count
+            self.live[self.count] = cell
+            self.count += 1
+            self.alive.flat[cell] = 1
+            self.prefix = None
+
+    def remove(self, cell):
+        """Удаление плитки: на ее место в списке живых встает последняя."""
+        i = self.slot[cell]
+        if i < 0:
+            return
+        last = self.count - 1
+        moved = self.live[last]
+        self.live[i] = moved
+        self.slot[moved] = i
+        self.slot[cell] = -1
+        self.count = last
+        self.hits[cell] = 0
+        self.alive.flat[cell] = 0
+        self.prefix = None
+
+    def sync(self, hits, color):
+        """Приведение сетки к массивам прочности и индексов цвета той же формы на месте.
+
+        В отличие от from_arrays() объект сетки сохраняется, а работа идет
+        только по изменившимся ячейкам. Возвращает массив их номеров.
+        """
+        hits = hits.ravel()
+        color = color.ravel()
+        changed = np.flatnonzero((self.hits != hits) | (self.color != color))
+        for cell in changed.tolist():
+            self.color[cell] = color[cell]
+            if hits[cell] > 0:
+                self.hits[cell] = hits[cell]
+                self.link(cell)
+            else:
+                self.remove(cell)
+        return changed
+
+    def hit(self, cell):
+        """Удар по плитке. Возвращает оставшуюся прочность; при нуле плитка удаляется."""
+        hits = int(self.hits[cell]) - 1
+        if hits <= 0:
+            self.remove(cell)
+            return 0
+        self.hits[cell] = hits
+        return hits
+
+    def bounds(self, cell):
+        """Границы плитки (left, top, right, bottom) без создания Rect."""
+        row, col = divmod(cell, self.cols)
+        left = col * self.cell_width + TILE_PADDING
+        top = row * self.cell_height + TILE_OFFSET_Y
+        return left, top, left + self.tile_width, top + self.tile_height
+
+    def rect(self, cell):
+        """Прямоугольник плитки для отрисовки."""
+        left, top, _, _ = self.bounds(cell)
+        return pygame.Rect(left, top, self.tile_width, self.tile_height)
+
+    def center(self, cell):
+        """Центр плитки."""
+        left, top, right, bottom = self.bounds(cell)
+        return (left + right) // 2, (top + bottom) // 2
+
+    def draw_tile(self, screen, cell):
+        """Отрисовка одной плитки."""
+        rect = self.rect(cell)
+        pygame.draw.rect(screen, self.palette[self.color[cell]], rect)
+        hits = int(self.hits[cell])
+        if hits > 1:
+            draw_text(screen, str(hits), rect.centerx, rect.centery - 5, font_size=20)
+        return rect
+
+    def draw(self, screen):
+        """Отрисовка всех живых плиток."""
+        for cell in self:
+            self.draw_tile(screen, cell)
+
+    def occupied(self, left, top, right, bottom):
+        """Пакетная проверка: есть ли живые плитки в ячейках, покрытых прямоугольниками.
+
+        Аргументы - массивы NumPy одинаковой длины (по прямоугольнику на мяч).
+        Проверка идет по ячейкам, поэтому консервативна: True означает лишь,
+        что мяч нужно проверить точно. Каждый прямоугольник отвечает за O(1)
+        благодаря таблице префиксных сумм.
+        """
+        if self.prefix is None:
+            self.prefix = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+            self.prefix[1:, 1:] = self.alive.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+        col_start = np.maximum((left - TILE_PADDING) // self.cell_width, 0).astype(np.int64)
+        col_end = np.minimum((right - TILE_PADDING) // self.cell_width, self.cols - 1).astype(np.int64)
+        row_start = np.maximum((top - TILE_OFFSET_Y) // self.cell_height, 0).astype(np.int64)
+        row_end = np.minimum((bottom - TILE_OFFSET_Y) // self.cell_height, self.rows - 1).astype(np.int64)
+        valid = (col_start <= col_end) & (row_start <= row_end)
+        # Для пустых диапазонов индексы подрезаются, результат все равно маскируется
+        col_end = np.maximum(col_end, col_start) + 1
+        row_end = np.maximum(row_end, row_start) + 1
+        col_start = np.minimum(col_start, self.cols)
+        row_start = np.minimum(row_start, self.rows)
+        col_end = np.minimum(col_end, self.cols)
+        row_end = np.minimum(row_end, self.rows)
+        p = self.prefix
+        total = p[row_end, col_end] - p[row_start, col_end] - p[row_end, col_start] + p[row_start, col_start]
+        return valid & (total > 0)
+
+    def query(self, left, top, right, bottom):
+        """Живые плитки (номера ячеек), пересекающие прямоугольник [left, right) x [top, bottom)."""
+        col_start = max(int((left - TILE_PADDING) // self.cell_width), 0)
+        col_end = min(int((right - TILE_PADDING) // self.cell_width), self.cols - 1)
+        row_start = max(int((top - TILE_OFFSET_Y) // self.cell_height), 0)
+        row_end = min(int((bottom - TILE_OFFSET_Y) // self.cell_height), self.rows - 1)
+        if col_start > col_end or row_start > row_end:
+            return []
+
+        found = []
+        alive = self.alive
+        cols = self.cols
+        for row in range(row_start, row_end + 1):
+            tile_top = row * self.cell_height + TILE_OFFSET_Y
+            if not (tile_top < bottom and top < tile_top + self.tile_height):
+                continue
+            for col in range(col_start, col_end + 1):
+                if alive[row, col]:
+                    tile_left = col * self.cell_width + TILE_PADDING
+                    if tile_left < right and left < tile_left + self.tile_width:
+                        found.append(row * cols + col)
+        return found
+
+    def __contains__(self, cell):
+        return self.slot[cell] >= 0
+
+    def __iter__(self):
+        return iter(self.live[:self.count].tolist())
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,38 @@
+# timestep.py
+
+from settings import TICK_RATE, MAX_CATCHUP_STEPS, MAX_FRAME_TIME
+
+
+class FixedTimestep:
+    """Аккумулятор фиксированного шага симуляции.
+
+    Реальное время кадра накапливается, и симуляция делает столько шагов
+    длиной 1 / tick_rate, сколько в нем помещается. Число шагов за кадр
+    ограничено max_steps: остаток сверх этого отбрасывается, чтобы медленный
+    кадр не порождал еще более медленный ("спираль смерти"). После advance()
+    в alpha лежит доля шага для интерполяции отрисовки.
+    """
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCHUP_STEPS, max_frame_time=MAX_FRAME_TIME):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_steps = 0  # Шаги, отброшенные ограничением догонки
+
+    def advance(self, frame_time):
+        """Добавляет время кадра (в секундах) и возвращает число шагов симуляции."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = self.dt * steps + self.accumulator % self.dt
+        self.accumulator -= steps * self.dt
+        self.alpha = self.accumulator / self.dt
+        return steps
+
+    def reset(self):
+        """Сброс накопленного времени (например, после паузы в меню)."""
+        self.accumulator = 0.0
+        self.alpha = 0.0
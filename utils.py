@@ -1,25 +1,133 @@
 # utils.py
 
+from collections import OrderedDict
+
 import pygame
 from settings import *
 
+
+class TextCache:
+    """Кэш шрифтов и отрисованных текстовых поверхностей.
+
+    Хранит по одному шрифту на каждый размер и LRU-список готовых поверхностей
+    с ключом (текст, цвет, размер, сглаживание). Объем памяти под поверхности
+    ограничен max_bytes: при переполнении вытесняются самые старые записи.
+    """
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.fonts = {}  # Шрифты по размеру
+        self.surfaces = OrderedDict()  # (text, color, size, antialias) -> (surface, bytes)
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_size):
+        """Возвращает общий шрифт заданного размера."""
+        font = self.fonts.get(font_size)
+        if font is None:
+            font = pygame.font.Font(None, font_size)
+            self.fonts[font_size] = font
+        return font
+
+    def render(self, text, color=WHITE, font_size=FONT_SIZE, antialias=True):
+        """Возвращает поверхность с текстом, отрисовывая ее только при промахе."""
+        key = (text, tuple(color), font_size, antialias)
+        entry = self.surfaces.get(key)
+        if entry is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        surface = self.get_font(font_size).render(text, antialias, color)
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        if size > self.max_bytes:
+            return surface  # Слишком большая поверхность: не кэшируем
+
+        self.surfaces[key] = (surface, size)
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.surfaces.popitem(last=False)
+            self.used_bytes -= evicted_size
+        return surface
+
+    def invalidate(self):
+        """Сбрасывает все шрифты и поверхности (например, после pygame.quit())."""
+        self.fonts.clear()
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        """Счетчики попаданий и промахов кэша."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "bytes": self.used_bytes,
+        }
+
+
+text_cache = TextCache()
+
+
 def draw_text(screen, text, x, y, color=WHITE, font_size=FONT_SIZE):
-    """Отрисовка текста на экране."""
-    font = pygame.font.Font(None, font_size)
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x, y))
+    """Отрисовка текста на экране. Возвращает занятый текстом прямоугольник."""
+    text_surface = text_cache.render(text, color, font_size)
+    return screen.blit(text_surface, (x, y))
+
+
+def invalidate_text_cache():
+    """Явный сброс кэша текста."""
+    text_cache.invalidate()
+
+
+class SilentSound:
+    """Беззвучная заглушка с интерфейсом pygame.mixer.Sound.
+
+    Подставляется, пока звук еще загружается, если файла нет или если
+    звуковое устройство недоступно.
+    """
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, value):
+        pass
+
+    def get_length(self):
+        return 0.0
+
+
+def load_sound(path):
+    """Загрузка одного звука; при ошибке возвращается SilentSound."""
+    try:
+        return pygame.mixer.Sound(path)
+    except (pygame.error, FileNotFoundError):
+        return SilentSound()
+
 
 def load_sounds():
-    """Загрузка звуковых эффектов и музыки."""
-    pygame.mixer.init()
-    sounds = {
-        "hit": pygame.mixer.Sound(SOUND_HIT),
-        "lose": pygame.mixer.Sound(SOUND_LOSE),
-        "bonus": pygame.mixer.Sound(SOUND_BONUS),
-    }
-    pygame.mixer.music.load(MUSIC_BACKGROUND)
+    """Загрузка звуковых эффектов и музыки.
+
+    Отсутствующие файлы и недоступный микшер не роняют игру: вместо звуков
+    возвращаются заглушки, а музыка просто не загружается.
+    """
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return {name: SilentSound() for name in SOUND_FILES}
+    sounds = {name: load_sound(path) for name, path in SOUND_FILES.items()}
+    try:
+        pygame.mixer.music.load(MUSIC_BACKGROUND)
+    except (pygame.error, FileNotFoundError):
+        pass
     return sounds
 
 def play_music():
-    """Запуск фоновой музыки."""
-    pygame.mixer.music.play(-1)
\ No newline at end of file
+    """Запуск фоновой музыки (если она загружена)."""
+    try:
+        pygame.mixer.music.play(-1)
+    except pygame.error:
+        pass